@@ -0,0 +1,90 @@
+from ohlc import OHLCView
+
+
+def resolve_trade(result, highs, lows, closes, start, max_hold=100):
+    """
+    Walk forward from bar ``start`` until the trade's SL or TP is hit.
+
+    When a bar touches both, the stop is assumed to fill first. A trade still
+    open after ``max_hold`` bars (or at the end of the data) is closed at the
+    last close. Returns (exit_index, r_multiple).
+    """
+    entry, sl, tp = float(result['entry']), float(result['sl']), float(result['tp'])
+    risk = abs(entry - sl)
+    if risk == 0:
+        return start, 0.0
+    buy = result['signal'] == 'buy'
+    end = min(len(closes), start + max_hold)
+
+    for j in range(start, end):
+        if buy:
+            if lows[j] <= sl:
+                return j, -1.0
+            if highs[j] >= tp:
+                return j, (tp - entry) / risk
+        else:
+            if highs[j] >= sl:
+                return j, -1.0
+            if lows[j] <= tp:
+                return j, (entry - tp) / risk
+
+    last = max(start, end - 1)
+    exit_price = float(closes[last])
+    return last, ((exit_price - entry) if buy else (entry - exit_price)) / risk
+
+
+def walk_forward(df, strategies, window=300, step=1, max_hold=100):
+    """
+    Replay strategies bar by bar over an OHLCView of history.
+
+    At every ``step`` bars each strategy sees only the last ``window`` closed
+    bars, exactly as in a live scan. Signals are resolved against the bars
+    that follow; a strategy holds at most one trade at a time. Returns a list
+    of trade dicts with the R-multiple of each outcome.
+    """
+    rates = df.rates
+    highs, lows, closes = df.values('high'), df.values('low'), df.values('close')
+    busy_until = {name: -1 for name in strategies}
+    trades = []
+
+    for i in range(window, len(rates) + 1, step):
+        view = OHLCView(rates[i - window:i], df.digits)
+        for strategy_name, strategy_func in strategies.items():
+            if i <= busy_until[strategy_name]:
+                continue
+            try:
+                result = strategy_func(view)
+            except Exception as e:
+                print(f"Error in {strategy_name} at bar {i}: {e}")
+                continue
+            if not result or i >= len(rates):
+                continue
+
+            exit_index, r_multiple = resolve_trade(result, highs, lows, closes, i, max_hold)
+            busy_until[strategy_name] = exit_index
+            trades.append({
+                'strategy': strategy_name, 'signal': result['signal'],
+                'entry': float(result['entry']), 'sl': float(result['sl']), 'tp': float(result['tp']),
+                'confidence': float(result.get('confidence', 0)),
+                'index': i - 1, 'exit_index': exit_index, 'r': r_multiple
+            })
+
+    return trades
+
+
+def summarize_trades(trades):
+    """Print trade count, win rate and average/total R per strategy"""
+    by_strategy = {}
+    for trade in trades:
+        by_strategy.setdefault(trade['strategy'], []).append(trade['r'])
+
+    if not by_strategy:
+        print("No trades")
+        return by_strategy
+
+    for strategy_name, r_multiples in sorted(by_strategy.items()):
+        wins = sum(1 for r in r_multiples if r > 0)
+        print(f"{strategy_name:12s} trades: {len(r_multiples):4d}  "
+              f"win rate: {wins / len(r_multiples) * 100:5.1f}%  "
+              f"avg R: {sum(r_multiples) / len(r_multiples):+.2f}  total R: {sum(r_multiples):+.1f}")
+    return by_strategy
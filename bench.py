@@ -0,0 +1,41 @@
+import subprocess
+import sys
+import time
+
+IMPORT_PROBE = "import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+
+
+def measure_import(module):
+    """Cold import time of a module in a fresh interpreter (None if it fails)"""
+    proc = subprocess.run([sys.executable, '-c', IMPORT_PROBE.format(module=module)],
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        return None
+    return float(proc.stdout.strip().splitlines()[-1])
+
+
+def bench_imports(modules):
+    """Print cold import times, e.g. to keep one-shot runs fast"""
+    print("📦 Cold import times:")
+    timings = {}
+    for module in modules:
+        timings[module] = measure_import(module)
+        if timings[module] is None:
+            print(f"   {module:14s} unavailable")
+        else:
+            print(f"   {module:14s} {timings[module] * 1000:8.1f} ms")
+    return timings
+
+
+def bench_strategies(df, strategies, repeats=20):
+    """Print the average latency of every strategy on the same bars"""
+    print(f"⏱️ Strategy latency over {len(df)} bars ({repeats} runs):")
+    timings = {}
+    for strategy_name, strategy_func in strategies.items():
+        started = time.perf_counter()
+        for _ in range(repeats):
+            strategy_func(df)
+        timings[strategy_name] = (time.perf_counter() - started) / repeats
+        print(f"   {strategy_name:12s} {timings[strategy_name] * 1000:8.2f} ms")
+    print(f"   {'total':12s} {sum(timings.values()) * 1000:8.2f} ms")
+    return timings
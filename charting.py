@@ -1,10 +1,15 @@
 # charting.py - Optional improvements (current version works fine!)
+import matplotlib
+# Charts are rendered on stage worker threads (see deadline.run_with_timeout);
+# GUI backends such as Windows' default TkAgg only work on the main thread
+matplotlib.use('Agg')
 import mplfinance as mpf
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import time
 import os
+from ohlc import as_frame
 
 def plot_signal_chart(df, signals, bot_name, pair, timeframe):
     """
@@ -20,7 +25,8 @@ def plot_signal_chart(df, signals, bot_name, pair, timeframe):
             print("⚠️ No signals provided for chart")
             return None
         
-        # Set up dataframe for plotting
+        # Set up dataframe for plotting (OHLC views are only converted here)
+        df = as_frame(df)
         df_plot = df.set_index('time') if 'time' in df.columns else df.copy()
         df_plot = df_plot.iloc[-60:]  # Zoom into last 60 candles
         
@@ -185,7 +191,7 @@ def plot_signal_chart_simple(df, signals, bot_name, pair, timeframe):
         from matplotlib.patches import FancyArrowPatch
         import mplfinance as mpf
         
-        df_plot = df.set_index('time')
+        df_plot = as_frame(df).set_index('time')
         df_plot = df_plot.iloc[-60:]  # Zoom into last 60 candles
         addplots = []
         annotations = []
@@ -0,0 +1,100 @@
+import time
+
+from indicators import ema, rsi
+
+TIMEFRAME_WEIGHTS = {'4H': 3.0, '1H': 2.0, '15m': 1.0}
+# Older entries are ignored; the limit is never below 1.5 scan intervals
+# (see ConfluenceCache) so the previous scan's entries still count
+MAX_AGE = {'4H': 8 * 3600, '1H': 2 * 3600, '15m': 30 * 60}
+DIRECTIONS = {'buy': 1, 'sell': -1}
+
+
+def timeframe_state(df, fast_span=20, slow_span=50, rsi_period=14):
+    """
+    Cheap trend/momentum state of one timeframe, kept for confluence scoring.
+
+    'trend' is the sign of fast EMA minus slow EMA; 'momentum' is +1 above
+    RSI 55, -1 below 45 and 0 in between.
+    """
+    close = df.values('close')
+    # The last few spans of bars are enough for the EMAs to settle
+    fast, slow = ema(close[-(slow_span * 4):], fast_span), ema(close[-(slow_span * 4):], slow_span)
+    trend = 1 if fast[-1] > slow[-1] else -1 if fast[-1] < slow[-1] else 0
+    rsi_value = float(rsi(close[-(rsi_period * 4):], rsi_period)[-1])
+    momentum = 1 if rsi_value > 55 else -1 if rsi_value < 45 else 0
+    return {'trend': trend, 'momentum': momentum, 'rsi': rsi_value}
+
+
+class ConfluenceCache:
+    """
+    Latest strategy results and indicator state per (pair, timeframe).
+
+    When a timeframe updates, its signals are scored against what the other
+    timeframes of the same pair last reported, without refetching or
+    recomputing them. Another timeframe counts +1 (weighted by
+    TIMEFRAME_WEIGHTS) when it has a signal in the same direction, -1 for
+    an opposite signal, and otherwise +/-0.25 each for its trend and RSI
+    momentum pointing with or against the signal. The weighted mean, between
+    -1 and 1, is the signal's 'confluence'.
+
+    Entries expire after the timeframe's ``max_age``, but never sooner than
+    1.5 x ``scan_interval``: every timeframe is refreshed only once per scan,
+    so a 15m entry is already a whole interval old when the next scan's 1H
+    signal is scored.
+    """
+
+    def __init__(self, weights=None, max_age=None, boost=0.5, scan_interval=None):
+        self.weights = weights or TIMEFRAME_WEIGHTS
+        self.max_age = max_age or MAX_AGE
+        self.boost = boost
+        self.scan_interval = scan_interval
+        self.entries = {}
+
+    def update(self, pair, timeframe_name, state, results):
+        self.entries[(pair, timeframe_name)] = {
+            'state': state,
+            'directions': {DIRECTIONS.get(r.get('signal'), 0) for r in results},
+            'updated': time.time()
+        }
+
+    def age_limit(self, timeframe_name):
+        """Seconds an entry of this timeframe counts for"""
+        limit = self.max_age.get(timeframe_name, 2 * 3600)
+        if self.scan_interval:
+            limit = max(limit, 1.5 * self.scan_interval)
+        return limit
+
+    def _others(self, pair, timeframe_name):
+        now = time.time()
+        for (other_pair, other_tf), entry in self.entries.items():
+            if other_pair != pair or other_tf == timeframe_name:
+                continue
+            if now - entry['updated'] <= self.age_limit(other_tf):
+                yield other_tf, entry
+
+    def score(self, pair, timeframe_name, result):
+        direction = DIRECTIONS.get(result.get('signal'), 0)
+        total, weight_sum = 0.0, 0.0
+        for other_tf, entry in self._others(pair, timeframe_name):
+            weight = self.weights.get(other_tf, 1.0)
+            if direction in entry['directions']:
+                agreement = 1.0
+            elif -direction in entry['directions']:
+                agreement = -1.0
+            else:
+                state = entry['state'] or {}
+                agreement = 0.25 * direction * (state.get('trend', 0) + state.get('momentum', 0))
+            total += weight * agreement
+            weight_sum += weight
+        return total / weight_sum if weight_sum else 0.0
+
+    def rank_score(self, result):
+        """Confidence scaled by (1 + boost * confluence)"""
+        return result.get('confidence', 50) * (1 + self.boost * result.get('confluence', 0.0))
+
+    def rank(self, pair, timeframe_name, results):
+        """Attach 'confluence' to each result and sort by rank_score, highest first"""
+        for result in results:
+            result['confluence'] = self.score(pair, timeframe_name, result)
+        results.sort(key=self.rank_score, reverse=True)
+        return results
@@ -0,0 +1,74 @@
+import threading
+import time
+
+
+class StageTimeout(TimeoutError):
+    """Raised when a stage overruns its deadline and is abandoned"""
+
+    def __init__(self, stage, timeout):
+        super().__init__(f"{stage} exceeded {timeout:.1f}s")
+        self.stage = stage
+        self.timeout = timeout
+
+
+class ScanBudget:
+    """
+    Deadline for a whole scan plus per-stage timeouts.
+
+    stage_timeout() returns the smaller of the stage's own limit and the time
+    left in the scan, so a single slow call can never push the scan past its
+    slot.
+    """
+
+    def __init__(self, scan_timeout, stage_timeouts=None):
+        self.deadline = time.time() + scan_timeout if scan_timeout else None
+        self.stage_timeouts = stage_timeouts or {}
+
+    def remaining(self):
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.time())
+
+    def expired(self):
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def stage_timeout(self, stage):
+        limits = [t for t in (self.stage_timeouts.get(stage), self.remaining()) if t is not None]
+        return min(limits) if limits else None
+
+    def run(self, stage, func, *args, **kwargs):
+        """Run func under this stage's timeout (see run_with_timeout)"""
+        return run_with_timeout(stage, self.stage_timeout(stage), func, *args, **kwargs)
+
+
+def run_with_timeout(stage, timeout, func, *args, **kwargs):
+    """
+    Call func(*args, **kwargs) and wait at most ``timeout`` seconds.
+
+    Blocking MT5/Telegram calls cannot be interrupted from Python, so an
+    overrunning call is left to finish on a daemon thread and StageTimeout is
+    raised; its result is discarded. With timeout=None the call runs inline.
+    """
+    if timeout is None:
+        return func(*args, **kwargs)
+    if timeout <= 0:
+        raise StageTimeout(stage, 0)
+
+    outcome = {}
+
+    def target():
+        try:
+            outcome['result'] = func(*args, **kwargs)
+        except BaseException as e:
+            outcome['error'] = e
+
+    worker = threading.Thread(target=target, name=f"stage-{stage}", daemon=True)
+    worker.start()
+    worker.join(timeout)
+
+    if worker.is_alive():
+        raise StageTimeout(stage, timeout)
+    if 'error' in outcome:
+        raise outcome['error']
+    return outcome.get('result')
@@ -0,0 +1,56 @@
+import numpy as np
+
+FIB_RATIOS = (0.236, 0.382, 0.5, 0.618, 0.786)
+
+
+def rolling_mean(values, period):
+    """Simple moving average, NaN until ``period`` values are available"""
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(len(values), np.nan)
+    if len(values) >= period:
+        csum = np.cumsum(np.insert(values, 0, 0.0))
+        out[period - 1:] = (csum[period:] - csum[:-period]) / period
+    return out
+
+
+def true_range(high, low, close):
+    """True range per bar; the first bar uses its high-low range"""
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    prev_close = np.empty_like(close)
+    prev_close[0] = np.nan
+    prev_close[1:] = close[:-1]
+    return np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+
+def atr(high, low, close, period=14):
+    """ATR as a simple mean of true range, matching the strategies' pandas version"""
+    return rolling_mean(true_range(high, low, close), period)
+
+
+def fib_levels(swing_high, swing_low, ratios=FIB_RATIOS):
+    """Retracement prices between a swing high and low (as in fibonacci_system)"""
+    return [swing_high - (swing_high - swing_low) * ratio for ratio in ratios]
+
+
+def ema(values, span):
+    """Exponential moving average, like pandas ewm(span=span, adjust=False).mean()"""
+    values = np.asarray(values, dtype=np.float64)
+    out = np.empty(len(values))
+    if len(values) == 0:
+        return out
+    alpha = 2.0 / (span + 1.0)
+    out[0] = values[0]
+    for i in range(1, len(values)):
+        out[i] = alpha * values[i] + (1.0 - alpha) * out[i - 1]
+    return out
+
+
+def rsi(close, period=14):
+    """RSI from simple rolling means of gains and losses, as in the strategies"""
+    delta = np.diff(np.asarray(close, dtype=np.float64), prepend=np.nan)
+    gain = rolling_mean(np.where(delta > 0, delta, 0.0), period)
+    loss = rolling_mean(np.where(delta < 0, -delta, 0.0), period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 - 100 / (1 + gain / loss)
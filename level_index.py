@@ -0,0 +1,94 @@
+from bisect import bisect_left, bisect_right
+
+from indicators import fib_levels
+
+
+def swing_levels(df, lookback=50, fib_lookback=100):
+    """
+    Support/resistance and Fibonacci levels of one timeframe.
+
+    'resistance' and 'support' hold the long and short rolling extremes used
+    by support_resistance, 'fib' the retracements used by fibonacci_system.
+    """
+    high, low = df.values('high'), df.values('low')
+    resistance = [float(high[-lookback:].max()), float(high[-(lookback // 2):].max())]
+    support = [float(low[-lookback:].min()), float(low[-(lookback // 2):].min())]
+    fib = [float(level) for level in fib_levels(high[-fib_lookback:].max(), low[-fib_lookback:].min())]
+    return {'resistance': resistance, 'support': support, 'fib': fib}
+
+
+class LevelIndex:
+    """
+    Sorted levels of one pair across all timeframes.
+
+    Levels are kept as parallel sorted lists of prices and (price,
+    timeframe, kind) entries. update() replaces one (timeframe, kind) source
+    and does nothing when its swings have not changed; otherwise only that
+    source's levels are removed and re-inserted. Proximity queries are
+    bisect lookups, O(log n) in the number of levels.
+    """
+
+    def __init__(self):
+        self._prices = []
+        self._entries = []
+        self._sources = {}
+
+    def __len__(self):
+        return len(self._prices)
+
+    def update(self, timeframe, kind, levels):
+        """Replace the levels of one source; returns True if anything changed"""
+        key = (timeframe, kind)
+        levels = sorted(levels)
+        if self._sources.get(key) == levels:
+            return False
+
+        for price in self._sources.get(key, []):
+            lo, hi = bisect_left(self._prices, price), bisect_right(self._prices, price)
+            for i in range(lo, hi):
+                if self._entries[i][1:] == key:
+                    del self._prices[i]
+                    del self._entries[i]
+                    break
+
+        for price in levels:
+            i = bisect_right(self._prices, price)
+            self._prices.insert(i, price)
+            self._entries.insert(i, (price, timeframe, kind))
+        self._sources[key] = levels
+        return True
+
+    def update_from(self, timeframe, df, lookback=50, fib_lookback=100):
+        """Refresh a timeframe's S/R and Fibonacci levels from its bars"""
+        changed = False
+        for kind, levels in swing_levels(df, lookback, fib_lookback).items():
+            changed = self.update(timeframe, kind, levels) or changed
+        return changed
+
+    def nearest(self, price):
+        """(entry, distance) of the level closest to price, or (None, inf)"""
+        i = bisect_left(self._prices, price)
+        best, distance = None, float('inf')
+        for j in (i - 1, i):
+            if 0 <= j < len(self._prices) and abs(self._prices[j] - price) < distance:
+                best, distance = self._entries[j], abs(self._prices[j] - price)
+        return best, distance
+
+    def within(self, price, tolerance):
+        """All level entries within +/- tolerance of price"""
+        lo = bisect_left(self._prices, price - tolerance)
+        hi = bisect_right(self._prices, price + tolerance)
+        return self._entries[lo:hi]
+
+
+class LevelRegistry:
+    """One LevelIndex per pair"""
+
+    def __init__(self):
+        self.indexes = {}
+
+    def for_pair(self, pair):
+        index = self.indexes.get(pair)
+        if index is None:
+            index = self.indexes[pair] = LevelIndex()
+        return index
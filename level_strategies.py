@@ -0,0 +1,155 @@
+import pandas as pd
+
+from indicators import FIB_RATIOS, atr, fib_levels, rsi
+from level_index import LevelIndex
+
+# Headroom on within() tolerances so float rounding at the edge never drops
+# a level the reference's exact proximity test would accept
+_TOLERANCE_SLACK = 1.000001
+
+
+def _own_levels(df, level_index, timeframe, price, tolerance, lookback, fib_lookback):
+    """
+    Level entries of this timeframe within tolerance of price.
+
+    Without a shared index, a throwaway one is built from df. A shared index
+    must already hold this df's levels (LevelIndex.update_from with the same
+    lookbacks), as process_pair_timeframe does before running strategies.
+    """
+    if level_index is None:
+        level_index = LevelIndex()
+        level_index.update_from(timeframe, df, lookback, fib_lookback)
+    return [entry for entry in level_index.within(price, tolerance * _TOLERANCE_SLACK)
+            if entry[1] == timeframe]
+
+
+def support_resistance_indexed(df, level_index=None, timeframe=None,
+                               lookback=50, proximity_pct=0.008, rr_ratio=2.0):
+    """
+    support_resistance driven by LevelIndex lookups.
+
+    Only levels within proximity_pct of the close are fetched from the
+    index, so the common no-signal case costs one bisect; ATR and RSI are
+    computed from the last bars only when a level is in range.
+    """
+    name = 'Enhanced Support/Resistance'
+    high, low, close = df.values('high'), df.values('low'), df.values('close')
+    current_price = float(close[-1])
+    idx = len(df) - 1
+
+    if len(df) >= lookback:
+        entries = _own_levels(df, level_index, timeframe, current_price,
+                              current_price * proximity_pct / (1 - proximity_pct), lookback, 2 * lookback)
+        resistance_levels = sorted((e[0] for e in entries if e[2] == 'resistance'), reverse=True)
+        support_levels = sorted(e[0] for e in entries if e[2] == 'support')
+    elif len(df) >= lookback // 2:
+        # The reference's long levels are NaN this early; only the short ones count
+        resistance_levels = [float(high[-(lookback // 2):].max())]
+        support_levels = [float(low[-(lookback // 2):].min())]
+    else:
+        return None
+
+    resistance_levels = [r for r in resistance_levels
+                         if abs(current_price - r) / r <= proximity_pct and current_price >= r * 0.998]
+    support_levels = [s for s in support_levels
+                      if abs(current_price - s) / s <= proximity_pct and current_price <= s * 1.002]
+    if not resistance_levels and not support_levels:
+        return None
+
+    tail = slice(-15, None)
+    current_atr = atr(high[tail], low[tail], close[tail], 14)[-1]
+    current_rsi = rsi(close[tail], 14)[-1]
+
+    # Highest resistance first, as the reference tests long before short
+    for resistance in resistance_levels:
+        if current_rsi > 60:
+            entry = current_price
+            sl = resistance + current_atr * 1.5
+            risk = sl - entry
+            tp = entry - risk * rr_ratio
+            proximity_score = (1 - abs(current_price - resistance) / resistance) * 50
+            confidence = proximity_score + min(40, current_rsi - 60)
+            return {
+                'name': name, 'type': 'sr', 'signal': 'sell',
+                'entry': entry, 'sl': sl, 'tp': tp, 'index': idx,
+                'level': resistance, 'rsi': current_rsi, 'confidence': confidence
+            }
+
+    for support in support_levels:
+        if current_rsi < 40:
+            entry = current_price
+            sl = support - current_atr * 1.5
+            risk = entry - sl
+            tp = entry + risk * rr_ratio
+            proximity_score = (1 - abs(current_price - support) / support) * 50
+            confidence = proximity_score + min(40, 40 - current_rsi)
+            return {
+                'name': name, 'type': 'sr', 'signal': 'buy',
+                'entry': entry, 'sl': sl, 'tp': tp, 'index': idx,
+                'level': support, 'rsi': current_rsi, 'confidence': confidence
+            }
+
+    return None
+
+
+def fibonacci_indexed(df, level_index=None, timeframe=None,
+                      lookback=100, rr_ratio=2.0, proximity_threshold=0.01):
+    """
+    fibonacci_system driven by LevelIndex lookups.
+
+    The closest retracement is looked up in the index within
+    proximity_threshold of the close; RSI and MACD are only computed when
+    one is in range.
+    """
+    name = 'Enhanced Fibonacci'
+    # The reference's swing levels are NaN before lookback bars, so it never signals
+    if len(df) < lookback:
+        return None
+
+    high, low, close = df.values('high'), df.values('low'), df.values('close')
+    entry = float(close[-1])
+    idx = len(df) - 1
+
+    entries = _own_levels(df, level_index, timeframe, entry, entry * proximity_threshold,
+                          lookback // 2, lookback)
+    candidates = [(abs(entry - e[0]) / entry, -e[0]) for e in entries if e[2] == 'fib']
+    candidates = [c for c in candidates if c[0] <= proximity_threshold]
+    if not candidates:
+        return None
+    # Ties go to the higher price, i.e. the smaller ratio, as in the reference
+    closest_fib = -min(candidates)[1]
+
+    swing_high, swing_low = float(high[-lookback:].max()), float(low[-lookback:].min())
+    fibs = fib_levels(swing_high, swing_low)
+    fib_level = FIB_RATIOS[min(range(len(fibs)), key=lambda i: abs(fibs[i] - closest_fib))]
+
+    current_rsi = rsi(close[-15:], 14)[-1]
+    series = pd.Series(close)
+    macd = series.ewm(span=12).mean() - series.ewm(span=26).mean()
+    macd_histogram = (macd - macd.ewm(span=9).mean()).values
+
+    if (entry <= closest_fib * 1.005 and fib_level <= 0.618 and
+            current_rsi < 70 and macd_histogram[-1] > macd_histogram[-2]):
+        sl = swing_low * 0.995
+        risk = entry - sl
+        tp = entry + risk * rr_ratio
+        confidence = (70 - current_rsi) + (1 - fib_level) * 50
+        return {
+            'name': name, 'type': 'fib', 'signal': 'buy',
+            'entry': entry, 'sl': sl, 'tp': tp, 'index': idx,
+            'fib_level': fib_level, 'rsi': current_rsi, 'confidence': confidence
+        }
+
+    if (entry >= closest_fib * 0.995 and fib_level >= 0.382 and
+            current_rsi > 30 and macd_histogram[-1] < macd_histogram[-2]):
+        sl = swing_high * 1.005
+        risk = sl - entry
+        tp = entry - risk * rr_ratio
+        confidence = current_rsi - 30 + fib_level * 50
+        return {
+            'name': name, 'type': 'fib', 'signal': 'sell',
+            'entry': entry, 'sl': sl, 'tp': tp, 'index': idx,
+            'fib_level': fib_level, 'rsi': current_rsi, 'confidence': confidence
+        }
+
+    return None
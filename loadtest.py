@@ -0,0 +1,292 @@
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import tracemalloc
+import types
+import zlib
+from contextlib import contextmanager
+
+import numpy as np
+
+import main
+from memwatch import rss_bytes, MB
+from ohlc import RATES_DTYPE
+
+# Values of mt5.TIMEFRAME_*; the first n are used for a run with n timeframes
+TIMEFRAME_POOL = {'4H': 16388, '1H': 16385, '15m': 15, '5m': 5, '1D': 16408}
+TIMEFRAME_SECONDS = {16388: 14400, 16385: 3600, 15: 900, 5: 300, 16408: 86400}
+
+
+def synthetic_rates(symbol, timeframe, count, rng):
+    """Random-walk OHLC bars in the MT5 rates layout, stable per symbol"""
+    base = 0.5 + (zlib.crc32(symbol.encode()) % 1500) / 1000
+    steps = rng.normal(0, base * 0.0015, count)
+    close = base * np.exp(np.cumsum(steps) / base)
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    wick = np.abs(rng.normal(0, base * 0.001, count))
+    rates = np.empty(count, dtype=RATES_DTYPE)
+    step = TIMEFRAME_SECONDS.get(timeframe, 3600)
+    rates['time'] = int(time.time()) // step * step - step * np.arange(count)[::-1]
+    rates['open'] = open_
+    rates['close'] = close
+    rates['high'] = np.maximum(open_, close) + wick
+    rates['low'] = np.minimum(open_, close) - wick
+    rates['tick_volume'] = rng.integers(100, 5000, count)
+    rates['spread'] = rng.integers(0, 30, count)
+    rates['real_volume'] = 0
+    return rates
+
+
+class FakeMT5:
+    """Stand-in for the MetaTrader5 module with configurable latency and failures"""
+
+    def __init__(self, symbols, latency=0.0, failure_rate=0.0, seed=0):
+        self.symbols = symbols
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.rng = np.random.default_rng(seed)
+        self.lock = threading.Lock()
+        self.calls = 0
+
+    def initialize(self):
+        return True
+
+    def shutdown(self):
+        pass
+
+    def copy_rates_from_pos(self, symbol, timeframe, start, count):
+        time.sleep(self.latency)
+        with self.lock:
+            self.calls += 1
+            if self.rng.random() < self.failure_rate:
+                return None
+            return synthetic_rates(symbol, timeframe, count, self.rng)
+
+    def symbol_info(self, symbol):
+        return types.SimpleNamespace(name=symbol, digits=5)
+
+    def symbols_get(self, group=None):
+        return [types.SimpleNamespace(name=name, trade_mode=4) for name in self.symbols]
+
+
+class FakeBot:
+    """Stand-in for telebot.TeleBot that counts calls and concurrent sends"""
+
+    def __init__(self, latency=0.0, failure_rate=0.0, seed=0):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def _call(self, method, items=1):
+        with self.lock:
+            self.calls[method] = self.calls.get(method, 0) + 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            time.sleep(self.latency)
+            with self.lock:
+                failed = self.rng.random() < self.failure_rate
+            if failed:
+                raise RuntimeError(f"fake {method} failure")
+            return [types.SimpleNamespace(photo=[types.SimpleNamespace(file_id=f"fake-{method}-{i}")])
+                    for i in range(items)]
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def send_message(self, chat_id, text, **kwargs):
+        return self._call('send_message')[0]
+
+    def send_photo(self, chat_id, photo, **kwargs):
+        return self._call('send_photo')[0]
+
+    def send_media_group(self, chat_id, media, **kwargs):
+        return self._call('send_media_group', len(media))
+
+
+def make_signal_strategy(signal_rate, seed=0):
+    """Strategy that fires a buy signal on a ``signal_rate`` fraction of calls"""
+    rng = random.Random(seed)
+
+    def load_signal(df):
+        if rng.random() >= signal_rate:
+            return None
+        entry = float(df['close'].iloc[-1])
+        return {'name': 'LoadTest', 'type': 'load', 'signal': 'buy', 'entry': entry,
+                'sl': entry * 0.998, 'tp': entry * 1.004, 'index': len(df) - 1, 'confidence': 50.0}
+    return load_signal
+
+
+def fake_plot_signal_chart(df, signals, bot_name, pair, timeframe):
+    """Writes a tiny placeholder file instead of rendering with mplfinance"""
+    filename = f"chart_{pair}_{timeframe}_{time.time_ns()}.png"
+    with open(filename, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+    return filename
+
+
+class PeakMemory:
+    """
+    Samples RSS of this process and its workers on a background thread
+    (tracemalloc peak of this process only without psutil)
+    """
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._tracing = rss_bytes() is None
+
+    def __enter__(self):
+        if self._tracing:
+            tracemalloc.start()
+        else:
+            self._thread = threading.Thread(target=self._sample, daemon=True)
+            self._thread.start()
+        return self
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, rss_bytes(children=True))
+            self._stop.wait(self.interval)
+
+    def __exit__(self, *exc):
+        if self._tracing:
+            self.peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        else:
+            self._stop.set()
+            self._thread.join()
+            self.peak = max(self.peak, rss_bytes(children=True))
+
+
+@contextmanager
+def patched_main(fake_mt5, fake_bot, pairs, timeframes, workers, signal_rate,
+                 real_strategies=True, render_charts=False):
+    """
+    Point main's scan path at the fakes for the duration of a run.
+
+    Sharded runs rely on worker processes being forked, so they inherit the
+    patched module (the default on Linux). Lazily created services are reset
+    so each run starts cold and none leaks into the next.
+    """
+    services = ('prioritizer', 'levels', 'confluence', 'dispatcher', 'strategy_pool',
+                'store', 'shadow', 'monitor')
+    saved = {name: getattr(main, name) for name in (
+        'mt5', 'bot', 'PAIRS', 'TIMEFRAMES', 'DISCOVER_SYMBOLS', 'SHARDED_MODE', 'SCAN_WORKERS',
+        'WORK_QUEUE_URL', 'DIGEST_MODE', 'PERSIST_BACKEND', 'SUBSCRIPTIONS_FILE',
+        'STRATEGY_POOL_WORKERS', 'SHADOW_SAMPLE_RATE', 'store_failed') + services}
+    saved_strategies = dict(main.STRATEGIES)
+    saved_charting = sys.modules.get('charting')
+
+    main.mt5, main.bot = fake_mt5, fake_bot
+    main.PAIRS, main.TIMEFRAMES = pairs, timeframes
+    main.DISCOVER_SYMBOLS = False
+    main.SHARDED_MODE, main.SCAN_WORKERS = workers > 1, workers
+    main.WORK_QUEUE_URL = None
+    main.DIGEST_MODE = True
+    main.PERSIST_BACKEND = None
+    main.SUBSCRIPTIONS_FILE = None
+    main.STRATEGY_POOL_WORKERS = 0
+    main.SHADOW_SAMPLE_RATE = 0.0
+    for name in services:
+        setattr(main, name, None)
+    main.store_failed = False
+
+    strategies = dict(main.load_strategies()) if real_strategies else {}
+    strategies['LoadTest'] = make_signal_strategy(signal_rate)
+    main.STRATEGIES.clear()
+    main.STRATEGIES.update(strategies)
+    if not render_charts:
+        sys.modules['charting'] = types.SimpleNamespace(plot_signal_chart=fake_plot_signal_chart)
+    try:
+        yield
+    finally:
+        if main.store:
+            main.store.stop()
+        if main.strategy_pool:
+            main.strategy_pool.close()
+        for name, value in saved.items():
+            setattr(main, name, value)
+        main.STRATEGIES.clear()
+        main.STRATEGIES.update(saved_strategies)
+        if saved_charting is not None:
+            sys.modules['charting'] = saved_charting
+        else:
+            sys.modules.pop('charting', None)
+
+
+def run_load(n_symbols, n_timeframes, workers, mt5_latency=0.0, mt5_failure_rate=0.0,
+             bot_latency=0.0, bot_failure_rate=0.0, signal_rate=0.05,
+             real_strategies=True, render_charts=False):
+    """One scan of the real run_all() against the fakes; returns a result dict"""
+    pairs = [f"SYN{i:03d}" for i in range(n_symbols)]
+    timeframes = dict(list(TIMEFRAME_POOL.items())[:n_timeframes])
+    fake_mt5 = FakeMT5(pairs, mt5_latency, mt5_failure_rate)
+    fake_bot = FakeBot(bot_latency, bot_failure_rate)
+
+    with patched_main(fake_mt5, fake_bot, pairs, timeframes, workers, signal_rate,
+                      real_strategies, render_charts):
+        with PeakMemory() as memory:
+            started = time.perf_counter()
+            metrics = main.run_all()
+            wall_time = time.perf_counter() - started
+
+    items = n_symbols * len(timeframes)
+    summary = metrics.summary()
+    return {
+        'symbols': n_symbols, 'timeframes': len(timeframes), 'workers': workers, 'items': items,
+        'wall_time': wall_time, 'throughput': items / wall_time if wall_time else 0.0,
+        'peak_memory_mb': memory.peak / MB,
+        'delivery_queue': summary['gauges'].get('delivery_queue', 0),
+        'telegram_calls': fake_bot.calls, 'telegram_peak_in_flight': fake_bot.peak_in_flight,
+        'counters': summary['counters']
+    }
+
+
+def sweep(symbol_counts, worker_counts, n_timeframes, out=None, **options):
+    """Run every (symbols, workers) combination and optionally save the results as JSON"""
+    results = []
+    for n_symbols in symbol_counts:
+        for workers in worker_counts:
+            result = run_load(n_symbols, n_timeframes, workers, **options)
+            results.append(result)
+            print(f"📈 {n_symbols} symbols x {result['timeframes']} tf, {workers} worker(s): "
+                  f"{result['wall_time']:.1f}s, {result['throughput']:.1f} items/s, "
+                  f"peak {result['peak_memory_mb']:.0f} MB, queue {result['delivery_queue']}")
+
+    if out:
+        with open(out, 'w') as f:
+            json.dump({'created': time.strftime('%Y-%m-%d %H:%M:%S'), 'options': options,
+                       'results': results}, f, indent=2)
+        print(f"💾 Results saved to {out}")
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Load-test run_all() with fake MT5 and Telegram")
+    parser.add_argument('--symbols', type=int, nargs='+', default=[10, 50, 100])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1])
+    parser.add_argument('--timeframes', type=int, default=3, choices=range(1, len(TIMEFRAME_POOL) + 1))
+    parser.add_argument('--mt5-latency', type=float, default=0.0)
+    parser.add_argument('--mt5-failure-rate', type=float, default=0.0)
+    parser.add_argument('--bot-latency', type=float, default=0.0)
+    parser.add_argument('--bot-failure-rate', type=float, default=0.0)
+    parser.add_argument('--signal-rate', type=float, default=0.05)
+    parser.add_argument('--no-strategies', action='store_true', help='only run the synthetic signal strategy')
+    parser.add_argument('--charts', action='store_true', help='render real charts (needs mplfinance)')
+    parser.add_argument('--out', default='loadtest.json')
+    args = parser.parse_args()
+
+    sweep(args.symbols, args.workers, args.timeframes, args.out,
+          mt5_latency=args.mt5_latency, mt5_failure_rate=args.mt5_failure_rate,
+          bot_latency=args.bot_latency, bot_failure_rate=args.bot_failure_rate,
+          signal_rate=args.signal_rate, real_strategies=not args.no_strategies,
+          render_charts=args.charts)
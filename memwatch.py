@@ -0,0 +1,121 @@
+import gc
+import os
+import sys
+import tracemalloc
+from collections import Counter
+
+MB = 1024 * 1024
+
+
+def rss_bytes(children=False):
+    """
+    Resident set size of this process, or None without psutil.
+
+    With ``children`` the RSS of all descendant processes (pool and shard
+    workers) is added; pages shared after fork are counted once per process,
+    so the total is an upper bound.
+    """
+    try:
+        import psutil
+    except ImportError:
+        return None
+    process = psutil.Process(os.getpid())
+    total = process.memory_info().rss
+    if children:
+        for child in process.children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except psutil.Error:
+                pass  # exited since it was listed
+    return total
+
+
+def live_figures():
+    """Open matplotlib figures (0 if pyplot was never imported)"""
+    pyplot = sys.modules.get('matplotlib.pyplot')
+    return len(pyplot.get_fignums()) if pyplot else 0
+
+
+def object_counts():
+    """Live objects tracked by the garbage collector, by type name"""
+    return Counter(type(obj).__name__ for obj in gc.get_objects())
+
+
+class MemoryMonitor:
+    """
+    Tracks memory of the long-running loop between scans.
+
+    Each check() records RSS (psutil), open matplotlib figures and the
+    object types whose live count grew the most since the previous check;
+    with ``trace_frames`` set it also diffs tracemalloc snapshots to show
+    which source lines allocated the growth. When RSS has grown by another
+    ``alert_mb`` since the first check, ``on_alert`` is called with a short
+    message (e.g. to notify Telegram).
+    """
+
+    def __init__(self, alert_mb=200, trace_frames=0, top=5, count_objects=True, on_alert=None):
+        self.alert_mb = alert_mb
+        self.trace_frames = trace_frames
+        self.top = top
+        self.count_objects = count_objects
+        self.on_alert = on_alert
+        self.baseline_rss = None
+        self.alert_level = 1
+        self.previous_counts = None
+        self.previous_snapshot = None
+        if trace_frames and not tracemalloc.is_tracing():
+            tracemalloc.start(trace_frames)
+
+    def check(self, metrics=None):
+        """Sample memory, print what grew and alert past the threshold"""
+        gc.collect()
+        report = {'rss': rss_bytes(), 'figures': live_figures(), 'grown_types': [], 'grown_lines': []}
+
+        if self.count_objects:
+            counts = object_counts()
+            if self.previous_counts is not None:
+                growth = counts.copy()
+                growth.subtract(self.previous_counts)
+                report['grown_types'] = [(name, n) for name, n in growth.most_common(self.top) if n > 0]
+            self.previous_counts = counts
+
+        if self.trace_frames:
+            snapshot = tracemalloc.take_snapshot()
+            if self.previous_snapshot is not None:
+                stats = snapshot.compare_to(self.previous_snapshot, 'lineno')
+                report['grown_lines'] = [str(stat) for stat in stats[:self.top] if stat.size_diff > 0]
+            self.previous_snapshot = snapshot
+
+        growth_mb = 0.0
+        if report['rss'] is not None:
+            if self.baseline_rss is None:
+                self.baseline_rss = report['rss']
+            growth_mb = (report['rss'] - self.baseline_rss) / MB
+        report['growth_mb'] = growth_mb
+
+        self._print(report)
+        if metrics is not None:
+            if report['rss'] is not None:
+                metrics.gauge('rss_mb', report['rss'] / MB)
+                metrics.gauge('rss_growth_mb', growth_mb)
+            metrics.gauge('live_figures', report['figures'])
+
+        if self.alert_mb and growth_mb >= self.alert_mb * self.alert_level:
+            self.alert_level = int(growth_mb // self.alert_mb) + 1
+            message = (f"RSS grew {growth_mb:.0f} MB since start "
+                       f"({report['rss'] / MB:.0f} MB, {report['figures']} open figure(s))")
+            print(f"🚨 Memory alert: {message}")
+            if self.on_alert:
+                self.on_alert(message)
+        return report
+
+    def _print(self, report):
+        if report['rss'] is not None:
+            print(f"🧠 RSS {report['rss'] / MB:.1f} MB ({report['growth_mb']:+.1f} MB since start), "
+                  f"{report['figures']} open figure(s)")
+        else:
+            print(f"🧠 {report['figures']} open figure(s) (install psutil for RSS)")
+        for name, n in report['grown_types']:
+            print(f"   +{n} {name}")
+        for line in report['grown_lines']:
+            print(f"   {line}")
@@ -0,0 +1,57 @@
+import time
+
+
+class ScanMetrics:
+    """
+    Counters and stage timings for one scan.
+
+    Counters are plain integers keyed by name (e.g. 'signals', 'late');
+    timings collect durations in seconds per stage so the summary can report
+    totals and worst cases; gauges hold the latest value of a ratio or level.
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self.counters = {}
+        self.timings = {}
+        self.gauges = {}
+
+    def incr(self, name, count=1):
+        self.counters[name] = self.counters.get(name, 0) + count
+
+    def observe(self, name, seconds):
+        self.timings.setdefault(name, []).append(seconds)
+
+    def gauge(self, name, value):
+        self.gauges[name] = value
+
+    def get(self, name):
+        return self.counters.get(name, 0)
+
+    def summary(self):
+        """Plain dict of counters, timing stats and wall time"""
+        timings = {}
+        for name, values in self.timings.items():
+            timings[name] = {
+                'count': len(values),
+                'total': sum(values),
+                'max': max(values),
+                'avg': sum(values) / len(values)
+            }
+        return {
+            'wall_time': time.time() - self.started,
+            'counters': dict(self.counters),
+            'timings': timings,
+            'gauges': dict(self.gauges)
+        }
+
+    def report(self):
+        """Print a short summary of the scan"""
+        summary = self.summary()
+        print(f"⏱️ Scan wall time: {summary['wall_time']:.1f}s")
+        for name, value in sorted(summary['counters'].items()):
+            print(f"   {name}: {value}")
+        for name, stats in sorted(summary['timings'].items()):
+            print(f"   {name}: {stats['count']} call(s), avg {stats['avg']:.2f}s, max {stats['max']:.2f}s")
+        for name, value in sorted(summary['gauges'].items()):
+            print(f"   {name}: {value:.2f}")
@@ -0,0 +1,68 @@
+import numpy as np
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def simulate(r_multiples, n_paths=10000, n_trades=None, method='bootstrap', risk_per_trade=0.01,
+             ruin_level=0.5, percentiles=PERCENTILES, seed=None):
+    """
+    Monte Carlo equity paths from a strategy's trade R-multiples.
+
+    'bootstrap' draws ``n_trades`` trades with replacement per path;
+    'shuffle' reorders the actual trades, so only the sequence changes. Every
+    path is a row of one (n_paths, n_trades) matrix: equity compounds
+    ``risk_per_trade`` of the account per 1R, and drawdowns come from the
+    running maximum along each row, with no Python loop over paths.
+
+    Returns ruin probability (equity ever at or below ``ruin_level`` of the
+    start), and percentiles of max drawdown and final equity.
+    """
+    r = np.asarray(r_multiples, dtype=np.float64)
+    if len(r) == 0:
+        return None
+    rng = np.random.default_rng(seed)
+
+    if method == 'shuffle':
+        order = np.argsort(rng.random((n_paths, len(r))), axis=1)
+        paths = r[order]
+    elif method == 'bootstrap':
+        paths = r[rng.integers(0, len(r), size=(n_paths, n_trades or len(r)))]
+    else:
+        raise ValueError(f"Unknown Monte Carlo method: {method}")
+
+    equity = np.empty((n_paths, paths.shape[1] + 1))
+    equity[:, 0] = 1.0
+    np.cumprod(np.maximum(1.0 + paths * risk_per_trade, 0.0), axis=1, out=equity[:, 1:])
+    peaks = np.maximum.accumulate(equity, axis=1)
+    max_drawdown = (1.0 - equity / peaks).max(axis=1)
+    final_equity = equity[:, -1]
+
+    return {
+        'method': method, 'paths': n_paths, 'trades': paths.shape[1],
+        'expectancy': float(r.mean()), 'win_rate': float((r > 0).mean()),
+        'ruin_probability': float((equity.min(axis=1) <= ruin_level).mean()),
+        'max_drawdown': {p: float(v) for p, v in zip(percentiles, np.percentile(max_drawdown, percentiles))},
+        'final_equity': {p: float(v) for p, v in zip(percentiles, np.percentile(final_equity, percentiles))}
+    }
+
+
+def analyze_trades(trades, group_by=('strategy', 'pair'), **options):
+    """Run simulate() for every group of trades (e.g. per strategy and pair)"""
+    groups = {}
+    for trade in trades:
+        key = tuple(trade.get(field) for field in group_by)
+        groups.setdefault(key, []).append(trade['r'])
+    return {key: simulate(r_multiples, **options) for key, r_multiples in sorted(groups.items())}
+
+
+def print_report(reports):
+    """Print ruin probability and drawdown/equity percentiles per group"""
+    for key, report in reports.items():
+        if report is None:
+            continue
+        label = ' '.join(str(part) for part in key if part is not None)
+        dd, eq = report['max_drawdown'], report['final_equity']
+        print(f"🎲 {label}: {report['trades']} trades x {report['paths']} paths ({report['method']}), "
+              f"expectancy {report['expectancy']:+.2f}R, ruin {report['ruin_probability'] * 100:.1f}%")
+        print(f"   max drawdown p50 {dd[50] * 100:.1f}%  p95 {dd[95] * 100:.1f}%")
+        print(f"   final equity p5 {eq[5]:.2f}x  p50 {eq[50]:.2f}x  p95 {eq[95]:.2f}x")
@@ -0,0 +1,271 @@
+import json
+import sqlite3
+import threading
+import time
+
+BAR_COLUMNS = ('time', 'open', 'high', 'low', 'close', 'tick_volume', 'spread', 'real_volume')
+
+COLUMNS = {
+    'bars':    ('pair', 'timeframe') + BAR_COLUMNS,
+    'signals': ('time', 'pair', 'timeframe', 'strategy', 'signal', 'entry', 'sl', 'tp', 'confidence', 'payload'),
+    'scans':   ('time', 'wall_time', 'payload')
+}
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bars (
+    pair TEXT NOT NULL, timeframe TEXT NOT NULL, time INTEGER NOT NULL,
+    open REAL, high REAL, low REAL, close REAL,
+    tick_volume INTEGER, spread INTEGER, real_volume INTEGER,
+    PRIMARY KEY (pair, timeframe, time)
+);
+CREATE TABLE IF NOT EXISTS signals (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, time REAL NOT NULL,
+    pair TEXT NOT NULL, timeframe TEXT NOT NULL, strategy TEXT NOT NULL, signal TEXT,
+    entry REAL, sl REAL, tp REAL, confidence REAL, payload TEXT
+);
+CREATE INDEX IF NOT EXISTS signals_pair_time ON signals (pair, time);
+CREATE INDEX IF NOT EXISTS signals_strategy_time ON signals (strategy, time);
+CREATE TABLE IF NOT EXISTS scans (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, time REAL NOT NULL, wall_time REAL, payload TEXT
+);
+CREATE INDEX IF NOT EXISTS scans_time ON scans (time);
+"""
+
+POSTGRES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bars (
+    pair TEXT NOT NULL, timeframe TEXT NOT NULL, time BIGINT NOT NULL,
+    open DOUBLE PRECISION, high DOUBLE PRECISION, low DOUBLE PRECISION, close DOUBLE PRECISION,
+    tick_volume BIGINT, spread INTEGER, real_volume BIGINT,
+    PRIMARY KEY (pair, timeframe, time)
+);
+CREATE TABLE IF NOT EXISTS signals (
+    id BIGSERIAL PRIMARY KEY, time DOUBLE PRECISION NOT NULL,
+    pair TEXT NOT NULL, timeframe TEXT NOT NULL, strategy TEXT NOT NULL, signal TEXT,
+    entry DOUBLE PRECISION, sl DOUBLE PRECISION, tp DOUBLE PRECISION,
+    confidence DOUBLE PRECISION, payload TEXT
+);
+CREATE INDEX IF NOT EXISTS signals_pair_time ON signals (pair, time);
+CREATE INDEX IF NOT EXISTS signals_strategy_time ON signals (strategy, time);
+CREATE TABLE IF NOT EXISTS scans (
+    id BIGSERIAL PRIMARY KEY, time DOUBLE PRECISION NOT NULL,
+    wall_time DOUBLE PRECISION, payload TEXT
+);
+CREATE INDEX IF NOT EXISTS scans_time ON scans (time);
+"""
+
+
+def _insert_sql(table, placeholder):
+    columns = COLUMNS[table]
+    values = ', '.join(placeholder(i) for i in range(1, len(columns) + 1))
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({values})"
+    if table == 'bars':
+        # The newest bar is still forming when fetched; later scans update it
+        updates = ', '.join(f"{c} = excluded.{c}" for c in BAR_COLUMNS if c != 'time')
+        sql += f" ON CONFLICT (pair, timeframe, time) DO UPDATE SET {updates}"
+    return sql
+
+
+class SQLiteBackend:
+    """Local SQLite database; used from the store's flush thread only"""
+
+    def __init__(self, path='ai_serpi.db'):
+        self.path = path
+        self.conn = None
+
+    def open(self):
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.executescript(SQLITE_SCHEMA)
+
+    def insert_many(self, table, rows):
+        with self.conn:
+            self.conn.executemany(_insert_sql(table, lambda i: '?'), rows)
+
+    def close(self):
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+
+class PostgresBackend:
+    """
+    Postgres through asyncpg.
+
+    asyncpg is async-only, so the backend owns a private event loop that the
+    store's flush thread drives; the scan path never touches it.
+    """
+
+    def __init__(self, dsn):
+        self.dsn = dsn
+        self.loop = None
+        self.conn = None
+
+    def open(self):
+        import asyncio
+        import asyncpg
+        self.loop = asyncio.new_event_loop()
+        self.conn = self.loop.run_until_complete(asyncpg.connect(self.dsn))
+        self.loop.run_until_complete(self.conn.execute(POSTGRES_SCHEMA))
+
+    def insert_many(self, table, rows):
+        self.loop.run_until_complete(
+            self.conn.executemany(_insert_sql(table, lambda i: f'${i}'), rows))
+
+    def close(self):
+        if self.conn:
+            self.loop.run_until_complete(self.conn.close())
+            self.loop.close()
+            self.conn = None
+
+
+class SignalStore:
+    """
+    Buffered persistence of bars, signals and scan stats.
+
+    record_* calls only append to an in-memory buffer under a lock; a
+    background thread flushes the buffers in batched inserts every
+    ``flush_interval`` seconds, or sooner once ``batch_size`` records are
+    waiting. Bars are converted to rows on the flush thread, and only bars
+    from the last one stored for that pair/timeframe onwards are written;
+    that last bar was still open when stored, so it is rewritten in place.
+
+    Persistence never fails the scan: the backend is opened on the flush
+    thread, and when opening or an insert fails the error is logged and the
+    backend is reopened after a backoff doubling up to ``max_retry_delay``.
+    Meanwhile at most ``max_pending`` records are buffered; newer ones are
+    dropped and counted in ``dropped``.
+    """
+
+    def __init__(self, backend, flush_interval=5.0, batch_size=500, max_pending=5000,
+                 max_retry_delay=300.0):
+        self.backend = backend
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.max_retry_delay = max_retry_delay
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread = None
+        self._pending = 0
+        self._buffers = {'bars': [], 'signals': [], 'scans': []}
+        self._last_bar_time = {}
+        self._open = False
+        self._retry_at = 0.0
+        self._retry_delay = 0.0
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='signal-store', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Flush what is left and close the backend"""
+        self._stopping = True
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join()
+        if self._open:
+            self._close_backend()
+
+    def _close_backend(self):
+        self._open = False
+        try:
+            self.backend.close()
+        except Exception as e:
+            print(f"⚠️ Failed to close persistence backend: {e}")
+
+    def _backoff(self, error, action):
+        self._retry_delay = min(max(self._retry_delay * 2, self.flush_interval), self.max_retry_delay)
+        self._retry_at = time.monotonic() + self._retry_delay
+        print(f"❌ Persistence {action} failed, retrying in {self._retry_delay:.0f}s: {error}")
+
+    def _ensure_open(self):
+        if self._open:
+            return True
+        if time.monotonic() < self._retry_at:
+            return False
+        try:
+            self.backend.open()
+        except Exception as e:
+            self._backoff(e, 'backend open')
+            return False
+        self._open = True
+        self._retry_delay = 0.0
+        return True
+
+    def _append(self, table, record):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.dropped += 1
+                if self.dropped == 1:
+                    print(f"⚠️ Persistence backlog full ({self.max_pending} records), dropping new records")
+                return
+            self._buffers[table].append(record)
+            self._pending += 1
+            full = self._pending >= self.batch_size
+        if full:
+            self._wakeup.set()
+
+    def record_bars(self, pair, timeframe, view):
+        """Queue an OHLCView's bars (rows are built on the flush thread)"""
+        self._append('bars', (pair, timeframe, view))
+
+    def record_signal(self, pair, timeframe, result):
+        payload = json.dumps({k: v.item() if hasattr(v, 'item') else v for k, v in result.items()})
+        self._append('signals', (
+            time.time(), pair, timeframe, result.get('strategy', result.get('name', '')), result.get('signal'),
+            float(result['entry']), float(result['sl']), float(result['tp']),
+            float(result['confidence']) if 'confidence' in result else None, payload
+        ))
+
+    def record_scan(self, summary):
+        self._append('scans', (time.time(), summary.get('wall_time'), json.dumps(summary)))
+
+    def _bar_rows(self, pair, timeframe, view, last_times):
+        key = (pair, timeframe)
+        times = view.values('time')
+        last = last_times.get(key)
+        start = 0 if last is None else int((times < last).sum())
+        if start >= len(times):
+            return []
+        last_times[key] = int(times[-1])
+        columns = [view.values(c)[start:].tolist() if c in view.columns else [None] * (len(times) - start)
+                   for c in BAR_COLUMNS]
+        return [(pair, timeframe) + row for row in zip(*columns)]
+
+    def flush(self):
+        """Write the buffers; returns False when the backend is unavailable"""
+        if not self._ensure_open():
+            return False
+        with self._lock:
+            buffers = self._buffers
+            self._buffers = {table: [] for table in buffers}
+            self._pending = 0
+
+        last_times = dict(self._last_bar_time)
+        bar_rows = []
+        for pair, timeframe, view in buffers['bars']:
+            bar_rows.extend(self._bar_rows(pair, timeframe, view, last_times))
+        buffers['bars'] = bar_rows
+
+        for table, rows in buffers.items():
+            if not rows:
+                continue
+            try:
+                self.backend.insert_many(table, rows)
+            except Exception as e:
+                # The batch is dropped; reconnect in case the connection died
+                self._backoff(e, f"insert of {len(rows)} {table} row(s)")
+                self._close_backend()
+                return False
+            if table == 'bars':
+                self._last_bar_time = last_times
+        return True
+
+    def _run(self):
+        while not self._stopping:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+        self.flush()
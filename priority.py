@@ -0,0 +1,102 @@
+import time
+
+import numpy as np
+
+from indicators import atr
+from level_index import swing_levels
+
+
+def scan_stats(df, level_index=None, atr_period=14, atr_average=50, level_lookback=50, fib_lookback=100):
+    """
+    Cheap volatility and level-proximity stats for one pair/timeframe.
+
+    atr_ratio is the latest ATR over its recent average; level_distance is
+    the distance from the last close to the nearest support/resistance
+    (support_resistance's short and long rolling extremes) or Fibonacci
+    level (fibonacci_system's retracements), in ATRs, and level_pct the same
+    distance as a fraction of price. With a pair's LevelIndex the nearest
+    level of any timeframe is used.
+    """
+    high, low, close = df.values('high'), df.values('low'), df.values('close')
+    atr_values = atr(high, low, close, atr_period)
+    current_atr = atr_values[-1]
+    average_atr = np.nanmean(atr_values[-atr_average:])
+    if not np.isfinite(current_atr) or not average_atr:
+        return None
+
+    price = float(close[-1])
+    if level_index is not None and len(level_index):
+        nearest = level_index.nearest(price)[1]
+    else:
+        levels = swing_levels(df, level_lookback, fib_lookback)
+        nearest = min(abs(price - level) for kind in levels.values() for level in kind)
+
+    return {
+        'atr_ratio': float(current_atr / average_atr),
+        'level_distance': nearest / float(current_atr) if current_atr else float('inf'),
+        'level_pct': nearest / price if price else float('inf'),
+        'updated': time.time()
+    }
+
+
+class ScanPrioritizer:
+    """
+    Orders (pair, timeframe) work items hottest first.
+
+    The score of an item is its cached atr_ratio plus a proximity bonus of
+    1 / (1 + level_distance), so expanding volatility and price sitting on
+    a level both push it up. Items never seen score infinitely high.
+
+    An item is quiet, and skipped, when its ATR is below ``quiet_atr_ratio``
+    of its average and the last close is farther than ``level_proximity``
+    (fraction of price) from every S/R and Fibonacci level. The default 1%
+    is the widest proximity support_resistance (0.8%) and fibonacci_system
+    (1%) accept, so neither level strategy can fire on a quiet item, and the
+    breakout/trend strategies are unlikely to while volatility contracts.
+    Quiet items are skipped at most ``max_skips`` scans in a row, so they
+    still get refreshed.
+    """
+
+    def __init__(self, quiet_atr_ratio=0.8, level_proximity=0.01, max_skips=2):
+        self.quiet_atr_ratio = quiet_atr_ratio
+        self.level_proximity = level_proximity
+        self.max_skips = max_skips
+        self.stats = {}
+        self.skips = {}
+
+    def update(self, pair, timeframe_name, df, level_index=None):
+        self.set_stats(pair, timeframe_name, scan_stats(df, level_index))
+
+    def set_stats(self, pair, timeframe_name, stats):
+        if stats:
+            self.stats[(pair, timeframe_name)] = stats
+
+    def score(self, pair, timeframe_name):
+        stats = self.stats.get((pair, timeframe_name))
+        if stats is None:
+            return float('inf')
+        return stats['atr_ratio'] + 1.0 / (1.0 + stats['level_distance'])
+
+    def is_quiet(self, pair, timeframe_name):
+        stats = self.stats.get((pair, timeframe_name))
+        if stats is None:
+            return False
+        return (stats['atr_ratio'] < self.quiet_atr_ratio
+                and stats.get('level_pct', 0.0) > self.level_proximity)
+
+    def order(self, items):
+        """
+        Split (pair, timeframe_name, ...) items into (ordered, skipped).
+
+        Ordered items are sorted by descending score.
+        """
+        ordered, skipped = [], []
+        for item in sorted(items, key=lambda item: self.score(item[0], item[1]), reverse=True):
+            key = (item[0], item[1])
+            if self.is_quiet(*key) and self.skips.get(key, 0) < self.max_skips:
+                self.skips[key] = self.skips.get(key, 0) + 1
+                skipped.append(item)
+            else:
+                self.skips[key] = 0
+                ordered.append(item)
+        return ordered, skipped
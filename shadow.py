@@ -0,0 +1,127 @@
+import random
+import time
+
+from ohlc import OHLCView
+
+PRICE_FIELDS = ('entry', 'sl', 'tp')
+
+
+def compare_results(reference, fast, price_tolerance=1e-5, confidence_tolerance=0.5):
+    """
+    Differences between a reference and a fast strategy result.
+
+    Prices are compared relative to the reference value, confidence in
+    absolute percentage points. Returns a list of human-readable
+    divergences, empty when the results agree.
+    """
+    if reference is None and fast is None:
+        return []
+    if reference is None or fast is None:
+        return [f"signal {'missing' if fast is None else 'extra'} in fast path"]
+
+    divergences = []
+    if reference['signal'] != fast['signal']:
+        divergences.append(f"signal {reference['signal']} != {fast['signal']}")
+    for field in PRICE_FIELDS:
+        ref_value, fast_value = float(reference[field]), float(fast[field])
+        if abs(ref_value - fast_value) > abs(ref_value) * price_tolerance:
+            divergences.append(f"{field} {ref_value:.5f} != {fast_value:.5f}")
+    if 'confidence' in reference or 'confidence' in fast:
+        ref_conf, fast_conf = float(reference.get('confidence', 0)), float(fast.get('confidence', 0))
+        if abs(ref_conf - fast_conf) > confidence_tolerance:
+            divergences.append(f"confidence {ref_conf:.1f} != {fast_conf:.1f}")
+    return divergences
+
+
+def shadow_compare(df, strategies, fast_strategies=None, compact=False, digits=None,
+                   price_tolerance=1e-5, confidence_tolerance=0.5):
+    """
+    Run every strategy on the pandas reference path and the fast path.
+
+    The reference path is the original DataFrame input (to_frame()); the
+    fast path is an OHLCView, optionally compacted, with any replacement
+    implementation from ``fast_strategies``. Both inputs are built afresh
+    from df's raw rates inside the timed sections, so each path pays its
+    own per-fetch conversion and no cached Series from the scan. Returns a
+    report with per-path timings, the speedup ratio and divergences per
+    strategy.
+    """
+    fast_strategies = fast_strategies or {}
+    report = {'reference_time': 0.0, 'fast_time': 0.0, 'divergences': {}}
+
+    started = time.perf_counter()
+    reference_df = OHLCView(df.rates, df.digits).to_frame()
+    report['reference_time'] += time.perf_counter() - started
+
+    started = time.perf_counter()
+    fast_df = OHLCView(df.rates, df.digits)
+    if compact:
+        fast_df = fast_df.compact(digits)
+    report['fast_time'] += time.perf_counter() - started
+
+    for strategy_name, strategy_func in strategies.items():
+        fast_func = fast_strategies.get(strategy_name, strategy_func)
+
+        errors = []
+        started = time.perf_counter()
+        try:
+            reference = strategy_func(reference_df)
+        except Exception as e:
+            reference = None
+            errors.append(f"reference error: {e}")
+        report['reference_time'] += time.perf_counter() - started
+
+        started = time.perf_counter()
+        try:
+            fast = fast_func(fast_df)
+        except Exception as e:
+            fast = None
+            errors.append(f"fast error: {e}")
+        report['fast_time'] += time.perf_counter() - started
+
+        # A failing path is reported as such, not as a missing signal
+        divergences = errors or compare_results(reference, fast, price_tolerance, confidence_tolerance)
+        if divergences:
+            report['divergences'][strategy_name] = divergences
+
+    report['speedup'] = report['reference_time'] / report['fast_time'] if report['fast_time'] else 0.0
+    return report
+
+
+class ShadowRunner:
+    """
+    Runs shadow_compare on a sampled fraction of scans.
+
+    Results only go to the console and the scan metrics ('shadow_runs',
+    'shadow_divergences', the two path timings and the running
+    'shadow_speedup'); nothing is ever sent to Telegram.
+    """
+
+    def __init__(self, strategies, sample_rate=0.05, fast_strategies=None, compact=False, **tolerances):
+        self.strategies = strategies
+        self.sample_rate = sample_rate
+        self.fast_strategies = fast_strategies
+        self.compact = compact
+        self.tolerances = tolerances
+        self.reference_total = 0.0
+        self.fast_total = 0.0
+
+    def maybe_run(self, pair, timeframe_name, df, metrics):
+        if random.random() >= self.sample_rate:
+            return None
+
+        report = shadow_compare(df, self.strategies, self.fast_strategies, self.compact,
+                                getattr(df, 'digits', None), **self.tolerances)
+        self.reference_total += report['reference_time']
+        self.fast_total += report['fast_time']
+
+        metrics.incr('shadow_runs')
+        metrics.observe('shadow_reference', report['reference_time'])
+        metrics.observe('shadow_fast', report['fast_time'])
+        if self.fast_total:
+            metrics.gauge('shadow_speedup', self.reference_total / self.fast_total)
+
+        for strategy_name, divergences in report['divergences'].items():
+            metrics.incr('shadow_divergences')
+            print(f"🔍 Shadow divergence {pair} {timeframe_name} {strategy_name}: {'; '.join(divergences)}")
+        return report
@@ -0,0 +1,186 @@
+import json
+import queue
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, wait
+
+SYMBOL_TRADE_MODE_DISABLED = 0  # mt5.SYMBOL_TRADE_MODE_DISABLED
+
+
+def discover_symbols(mt5, group=None):
+    """
+    Names of tradable symbols offered by the broker.
+
+    ``group`` is passed through to mt5.symbols_get (e.g. "*USD*,!*BTC*").
+    Symbols whose trading is disabled are left out.
+    """
+    if not mt5.initialize():
+        raise RuntimeError("MT5 initialization failed")
+    try:
+        symbols = mt5.symbols_get(group) if group else mt5.symbols_get()
+    finally:
+        mt5.shutdown()
+
+    if not symbols:
+        return []
+    return [s.name for s in symbols
+            if getattr(s, 'trade_mode', None) != SYMBOL_TRADE_MODE_DISABLED]
+
+
+def shard_items(items, n_shards):
+    """Split work items round-robin into at most n_shards non-empty shards"""
+    n_shards = max(1, min(n_shards, len(items)))
+    return [items[i::n_shards] for i in range(n_shards) if items[i::n_shards]]
+
+
+class LocalWorkQueue:
+    """In-process stand-in for RedisWorkQueue, used by tests and single-host runs"""
+
+    def __init__(self):
+        self._tasks = queue.Queue()
+        self._results = queue.Queue()
+
+    def push_task(self, task):
+        self._tasks.put(task)
+
+    def pop_task(self, timeout=None):
+        try:
+            return self._tasks.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def push_result(self, result):
+        self._results.put(result)
+
+    def pop_result(self, timeout=None):
+        try:
+            return self._results.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class RedisWorkQueue:
+    """
+    Work queue shared between nodes through a Redis-compatible server.
+
+    Tasks and results are JSON documents in two lists, so any node running
+    worker_loop against the same URL and name picks up shards. The lists
+    outlive a scan, so scan_sharded tags every task with a scan id and
+    drops results carrying another one.
+    """
+
+    def __init__(self, url, name='ai_serpi:scan'):
+        import redis
+        self.client = redis.Redis.from_url(url)
+        self.tasks_key = f"{name}:tasks"
+        self.results_key = f"{name}:results"
+
+    def _pop(self, key, timeout):
+        if timeout is None or timeout > 0:
+            # BLPOP treats 0 as "block forever" and only takes whole seconds
+            item = self.client.blpop(key, timeout=0 if timeout is None else max(1, round(timeout)))
+            return json.loads(item[1]) if item else None
+        item = self.client.lpop(key)
+        return json.loads(item) if item else None
+
+    def push_task(self, task):
+        self.client.rpush(self.tasks_key, json.dumps(task))
+
+    def pop_task(self, timeout=None):
+        return self._pop(self.tasks_key, timeout)
+
+    def push_result(self, result):
+        self.client.rpush(self.results_key, json.dumps(result))
+
+    def pop_result(self, timeout=None):
+        return self._pop(self.results_key, timeout)
+
+
+def run_shard(handler, shard):
+    """Run handler over every item of a shard (executed inside a worker)"""
+    return [handler(item) for item in shard]
+
+
+def worker_loop(work_queue, handler, idle_timeout=1.0, forever=False):
+    """
+    Pop shards from work_queue, process them and push the results back.
+
+    Returns once the queue stays empty for idle_timeout seconds, unless
+    ``forever`` is set (long-running worker nodes).
+    """
+    processed = 0
+    while True:
+        task = work_queue.pop_task(timeout=idle_timeout)
+        if task is None:
+            if forever:
+                continue
+            return processed
+        work_queue.push_result({'scan': task.get('scan'), 'shard': task['shard'],
+                                'results': run_shard(handler, task['items'])})
+        processed += 1
+
+
+def scan_sharded(items, handler, workers=4, work_queue=None, local_workers=0,
+                 shards_per_worker=4, timeout=None):
+    """
+    Distribute work items over worker processes or a work queue.
+
+    Without a queue, shards go to a ProcessPoolExecutor of ``workers``
+    processes; ``handler`` must be a picklable module-level function. With a
+    queue, shards are pushed as tasks and collected from the result list
+    while ``local_workers`` threads (and any remote worker_loop nodes) drain
+    it. Several shards per worker keep workers busy when items take uneven
+    time. Shards not finished within ``timeout`` seconds are abandoned.
+    Returns the handler results, in no particular order.
+    """
+    shards = shard_items(list(items), workers * shards_per_worker)
+    if not shards:
+        return []
+
+    if work_queue is None:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        try:
+            futures = [pool.submit(run_shard, handler, shard) for shard in shards]
+            done, not_done = wait(futures, timeout=timeout)
+        finally:
+            # Don't wait for overrunning shards; queued ones are cancelled
+            pool.shutdown(wait=False, cancel_futures=True)
+        results = []
+        for future in done:
+            try:
+                results.extend(future.result())
+            except Exception as e:
+                print(f"❌ Shard failed: {e}")
+        if not_done:
+            print(f"⚠️ {len(not_done)} shard(s) missing after {timeout}s")
+        return results
+
+    scan_id = uuid.uuid4().hex
+    for i, shard in enumerate(shards):
+        work_queue.push_task({'scan': scan_id, 'shard': i, 'items': shard})
+
+    threads = [threading.Thread(target=worker_loop, args=(work_queue, handler, 0), daemon=True)
+               for _ in range(local_workers)]
+    for thread in threads:
+        thread.start()
+
+    deadline = time.time() + timeout if timeout else None
+    results = []
+    received = 0
+    while received < len(shards):
+        remaining = deadline - time.time() if deadline else None
+        if remaining is not None and remaining <= 0:
+            break
+        shard_result = work_queue.pop_result(timeout=remaining)
+        if shard_result is None:
+            break
+        if shard_result.get('scan') != scan_id:
+            # Left over from an earlier scan that gave up on it
+            continue
+        results.extend(shard_result['results'])
+        received += 1
+
+    if received < len(shards):
+        print(f"⚠️ {len(shards) - received} shard(s) missing after {timeout}s")
+    return results
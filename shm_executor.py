@@ -0,0 +1,108 @@
+import importlib
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from ohlc import OHLCView
+
+RECORD_FIELDS = ('name', 'type', 'signal', 'entry', 'sl', 'tp', 'index', 'confidence')
+
+_strategies = None
+
+
+def _init_worker(strategy_modules):
+    """Import the strategies once per worker process"""
+    global _strategies
+    _strategies = {name: getattr(importlib.import_module(module_name), func_name)
+                   for name, (module_name, func_name) in strategy_modules.items()}
+
+
+def to_record(result):
+    """
+    Pack a strategy result into a compact tuple.
+
+    The core fields come first in RECORD_FIELDS order, followed by a dict of
+    any extra metrics (rsi, adx, volume_ratio, ...) as plain floats.
+    """
+    core = tuple(result.get(field) for field in RECORD_FIELDS)
+    core = tuple(v.item() if hasattr(v, 'item') else v for v in core)
+    extras = {k: v.item() if hasattr(v, 'item') else v
+              for k, v in result.items() if k not in RECORD_FIELDS}
+    return core + (extras,)
+
+
+def from_record(record):
+    """Rebuild a strategy result dict from to_record's tuple"""
+    result = {field: value for field, value in zip(RECORD_FIELDS, record) if value is not None}
+    result.update(record[-1])
+    return result
+
+
+def _run_strategy(handle, strategy_name):
+    """Attach to the shared bars, run one strategy and return its record"""
+    shm_name, descr, length, digits = handle
+    # The parent owns and unlinks the block. Pool workers share the parent's
+    # resource tracker under every start method, so attaching only repeats
+    # the parent's registration and must not be undone here (unregistering
+    # would make the parent's unlink() fail in the tracker, and on Windows
+    # there is no tracker at all)
+    if sys.version_info >= (3, 13):
+        shm = shared_memory.SharedMemory(name=shm_name, track=False)
+    else:
+        shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        rates = np.ndarray(length, dtype=np.dtype(descr), buffer=shm.buf)
+        result = _strategies[strategy_name](OHLCView(rates, digits))
+        return to_record(result) if result else None
+    finally:
+        rates = None
+        try:
+            shm.close()
+        except BufferError:
+            # A lingering pandas reference to the buffer; the mapping goes
+            # away with it
+            pass
+
+
+class StrategyPool:
+    """
+    Persistent process pool that evaluates strategies over shared bars.
+
+    run() copies a symbol's rates array into one multiprocessing.shared_memory
+    block and submits one task per strategy; tasks carry only the block name,
+    dtype and length, and results come back as compact records. Strategies
+    are imported once per worker from ``strategy_modules``
+    ({name: (module, function)}, as in main.STRATEGY_MODULES).
+    """
+
+    def __init__(self, strategy_modules, workers=None):
+        self.names = list(strategy_modules)
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                        initargs=(strategy_modules,))
+
+    def run(self, df, timeout=None):
+        """Evaluate every strategy on an OHLCView; returns {name: result or None}"""
+        rates = df.rates
+        shm = shared_memory.SharedMemory(create=True, size=max(1, rates.nbytes))
+        try:
+            np.ndarray(len(rates), dtype=rates.dtype, buffer=shm.buf)[:] = rates
+            handle = (shm.name, rates.dtype.descr, len(rates), df.digits)
+            futures = {name: self.pool.submit(_run_strategy, handle, name) for name in self.names}
+
+            results = {}
+            for name, future in futures.items():
+                try:
+                    record = future.result(timeout)
+                    results[name] = from_record(record) if record else None
+                except Exception as e:
+                    print(f"Error in {name}: {e}")
+                    results[name] = None
+            return results
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def close(self):
+        self.pool.shutdown()
@@ -0,0 +1,285 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from deadline import StageTimeout, run_with_timeout
+
+MEDIA_GROUP_LIMIT = 10
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket; acquire() blocks until enough tokens are
+    available. A request larger than the capacity is granted once the bucket
+    is full and leaves it in debt, so later requests wait for the excess.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        needed = min(tokens, self.capacity)
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= needed:
+                    self.tokens -= tokens
+                    return
+                wait = (needed - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class Subscription:
+    """
+    One chat's filter. Empty pairs/timeframes/strategies mean "all"; a
+    strategy matches either its STRATEGIES key or the result's name.
+    """
+
+    def __init__(self, chat_id, pairs=None, timeframes=None, strategies=None, min_confidence=0):
+        self.chat_id = chat_id
+        self.pairs = set(pairs or [])
+        self.timeframes = set(timeframes or [])
+        self.strategies = set(strategies or [])
+        self.min_confidence = min_confidence
+
+    def matches(self, pair, timeframe, result):
+        if self.pairs and pair not in self.pairs:
+            return False
+        if self.timeframes and timeframe not in self.timeframes:
+            return False
+        if self.strategies and not self.strategies & {result.get('strategy'), result.get('name')}:
+            return False
+        return result.get('confidence', 50) >= self.min_confidence
+
+
+class SubscriptionRegistry:
+    """Subscriptions loaded from a JSON list of Subscription keyword dicts"""
+
+    def __init__(self, subscriptions=None):
+        self.subscriptions = list(subscriptions or [])
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls(Subscription(**entry) for entry in json.load(f))
+
+    def add(self, subscription):
+        self.subscriptions.append(subscription)
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump([{
+                'chat_id': s.chat_id, 'pairs': sorted(s.pairs), 'timeframes': sorted(s.timeframes),
+                'strategies': sorted(s.strategies), 'min_confidence': s.min_confidence
+            } for s in self.subscriptions], f, indent=2)
+
+    def recipients(self, pair, timeframe, result):
+        return [s.chat_id for s in self.subscriptions if s.matches(pair, timeframe, result)]
+
+    def best_matches(self, pair, timeframe, results):
+        """{chat_id: first of the ranked ``results`` each subscription accepts}"""
+        matches = {}
+        for subscription in self.subscriptions:
+            for result in results:
+                if subscription.matches(pair, timeframe, result):
+                    matches.setdefault(subscription.chat_id, result)
+                    break
+        return matches
+
+
+class FanOutDispatcher:
+    """
+    Delivers a scan's signals to every subscribed chat within Telegram limits.
+
+    Each chat gets the best-ranked signal of a pair/timeframe that its
+    subscription accepts. Chats are served from a thread pool, so a chat
+    waiting on its own bucket does not hold up the others. Each API call
+    takes a token from the global bucket (messages per second across all
+    chats) and from the chat's own bucket (1/s for private chats, 20/min for
+    groups, whose ids are negative); a media group takes one token per photo.
+    Calls are abandoned after ``send_timeout`` seconds. Each message tries
+    the item's formats in order (Markdown, HTML, plain text, as for the
+    single chat). Each chart is rendered once and uploaded once: the first
+    chat to send it holds the item's upload lock, the others wait for it and
+    reuse the Telegram file_id.
+    """
+
+    def __init__(self, bot, registry, global_rate=30, chat_rate=1.0, group_rate=20 / 60,
+                 send_timeout=None, chat_workers=8):
+        self.bot = bot
+        self.registry = registry
+        self.global_bucket = TokenBucket(global_rate)
+        self.chat_rate = chat_rate
+        self.group_rate = group_rate
+        self.send_timeout = send_timeout
+        self.chat_workers = chat_workers
+        self.chat_buckets = {}
+        self.lock = threading.Lock()
+
+    def _throttle(self, chat_id, tokens=1):
+        with self.lock:
+            bucket = self.chat_buckets.get(chat_id)
+            if bucket is None:
+                rate = self.group_rate if str(chat_id).startswith('-') else self.chat_rate
+                bucket = self.chat_buckets[chat_id] = TokenBucket(rate, 1)
+        bucket.acquire(tokens)
+        self.global_bucket.acquire(tokens)
+
+    def _call(self, method, *args, **kwargs):
+        return run_with_timeout('send', self.send_timeout, getattr(self.bot, method), *args, **kwargs)
+
+    def dispatch(self, digest, render, formats):
+        """
+        Send digest entries [(pair, timeframe, df, results), ...], results
+        ranked best first, to their subscribers. ``render(pair, timeframe,
+        df, result)`` returns a chart path or None; ``formats(result, pair,
+        timeframe)`` the [(text, parse_mode), ...] to try in order. Returns
+        the number of (chat, signal) deliveries.
+        """
+        from telebot.types import InputMediaPhoto
+
+        items = {}
+        by_chat = {}
+        for pair, timeframe, df, results in digest:
+            for chat_id, result in self.registry.best_matches(pair, timeframe, results).items():
+                item = items.get(id(result))
+                if item is None:
+                    item = items[id(result)] = {
+                        'pair': pair, 'timeframe': timeframe, 'result': result, 'seq': len(items),
+                        'chart': render(pair, timeframe, df, result), 'file_id': None,
+                        'upload_lock': threading.Lock(), 'formats': formats(result, pair, timeframe)}
+                by_chat.setdefault(chat_id, []).append(item)
+
+        delivered = 0
+        try:
+            if by_chat:
+                with ThreadPoolExecutor(max_workers=min(self.chat_workers, len(by_chat))) as pool:
+                    futures = [pool.submit(self._deliver, chat_id, chat_items, InputMediaPhoto)
+                               for chat_id, chat_items in by_chat.items()]
+                    delivered = sum(future.result() for future in futures)
+        finally:
+            for item in items.values():
+                if item['chart'] and os.path.exists(item['chart']):
+                    os.remove(item['chart'])
+        print(f"📡 {delivered} delivery(ies) to {len(by_chat)} chat(s)")
+        return delivered
+
+    def _deliver(self, chat_id, chat_items, media_type):
+        """Send one chat's items: text-only ones first, then charts in media groups"""
+        delivered = 0
+        for item in [i for i in chat_items if not i['chart']]:
+            delivered += self._send_text(chat_id, item)
+        with_chart = [i for i in chat_items if i['chart']]
+        for start in range(0, len(with_chart), MEDIA_GROUP_LIMIT):
+            chunk = with_chart[start:start + MEDIA_GROUP_LIMIT]
+            sent = self._send_charts(chat_id, chunk, media_type)
+            if sent is None:
+                print(f"⚠️ Falling back to per-signal sends for {chat_id}")
+                sent = sum(self._send_photo(chat_id, item) for item in chunk)
+            delivered += sent
+        return delivered
+
+    def _attempt(self, chat_id, item, send, tokens=1):
+        """Call send(text, parse_mode) with each of the item's formats until one is accepted"""
+        error = None
+        for text, parse_mode in item['formats']:
+            try:
+                self._throttle(chat_id, tokens)
+                return send(text, parse_mode)
+            except StageTimeout:
+                # The message may still land, so it is not resent in another format
+                raise
+            except Exception as e:
+                print(f"⚠️ {parse_mode or 'Plain text'} failed for {chat_id}: {e}")
+                error = e
+        raise error
+
+    @contextmanager
+    def _uploading(self, items):
+        """Hold the upload locks of items not uploaded yet (in a fixed order, so chats never deadlock)"""
+        locks = [item['upload_lock'] for item in sorted(items, key=lambda i: i['seq'])
+                 if item['file_id'] is None]
+        for lock in locks:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in locks:
+                lock.release()
+
+    def _send_text(self, chat_id, item):
+        try:
+            self._attempt(chat_id, item, lambda text, parse_mode: self._call(
+                'send_message', chat_id, text, parse_mode=parse_mode))
+            return 1
+        except Exception as e:
+            print(f"❌ Failed to send {item['pair']} {item['timeframe']} to {chat_id}: {e}")
+            return 0
+
+    def _remember_file_id(self, item, message):
+        if item['file_id'] is None and getattr(message, 'photo', None):
+            item['file_id'] = message.photo[-1].file_id
+
+    def _post_photo(self, chat_id, item, text, parse_mode):
+        if item['file_id'] is not None:
+            return self._call('send_photo', chat_id, item['file_id'], caption=text[:1024],
+                              parse_mode=parse_mode)
+        with open(item['chart'], 'rb') as photo:
+            message = self._call('send_photo', chat_id, photo, caption=text[:1024], parse_mode=parse_mode)
+        self._remember_file_id(item, message)
+        return message
+
+    def _send_photo(self, chat_id, item):
+        try:
+            with self._uploading([item]):
+                self._attempt(chat_id, item, lambda text, parse_mode: self._post_photo(
+                    chat_id, item, text, parse_mode))
+            return 1
+        except Exception as e:
+            print(f"❌ Failed to send chart for {item['pair']} {item['timeframe']} to {chat_id}: {e}")
+            return 0
+
+    def _send_charts(self, chat_id, chunk, media_type):
+        """
+        Send a chunk as one media group in its first format. Returns the
+        number sent, 0 after a timeout (the upload may still land, so nothing
+        is resent) or None when Telegram rejected it and the items should be
+        sent one by one, which also tries the other formats.
+        """
+        if len(chunk) == 1:
+            return self._send_photo(chat_id, chunk[0])
+        files = []
+        try:
+            with self._uploading(chunk):
+                media = []
+                for item in chunk:
+                    photo = item['file_id']
+                    if photo is None:
+                        photo = open(item['chart'], 'rb')
+                        files.append(photo)
+                    text, parse_mode = item['formats'][0]
+                    media.append(media_type(photo, caption=text[:1024], parse_mode=parse_mode))
+
+                self._throttle(chat_id, len(chunk))
+                messages = self._call('send_media_group', chat_id, media)
+                for item, message in zip(chunk, messages):
+                    self._remember_file_id(item, message)
+            return len(chunk)
+        except StageTimeout as e:
+            print(f"⏰ Media group to {chat_id} abandoned: {e}")
+            return 0
+        except Exception as e:
+            print(f"❌ Failed to send {len(chunk)} chart(s) to {chat_id}: {e}")
+            return None
+        finally:
+            for f in files:
+                f.close()
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from ohlc import PRICE_COLUMNS, RATES_DTYPE
+
+
+def flat_rates(prices, digits=None, step=900, start=1700000000):
+    """MT5 rates whose open/high/low/close all equal ``prices``"""
+    prices = np.asarray(prices, dtype=float)
+    if digits is not None:
+        prices = np.round(prices, digits)
+    rates = np.zeros(len(prices), dtype=RATES_DTYPE)
+    rates['time'] = start + step * np.arange(len(prices))
+    for column in PRICE_COLUMNS:
+        rates[column] = prices
+    rates['tick_volume'] = 1200
+    rates['spread'] = 12
+    return rates
+
+
+def random_walk(seed, count=300, step=3600, start=1700000000):
+    """Seeded random-walk MT5 rates with wicks and volumes"""
+    rng = np.random.default_rng(seed)
+    close = 1.1 * np.exp(np.cumsum(rng.normal(0, 0.002, count)))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    wick = np.abs(rng.normal(0, 0.001, count))
+    rates = np.zeros(count, dtype=RATES_DTYPE)
+    rates['time'] = start + step * np.arange(count)
+    rates['open'], rates['close'] = open_, close
+    rates['high'] = np.maximum(open_, close) + wick
+    rates['low'] = np.minimum(open_, close) - wick
+    rates['tick_volume'] = rng.integers(100, 5000, count)
+    return rates
+
+
+@pytest.fixture
+def make_rates():
+    return flat_rates
+
+
+@pytest.fixture
+def make_walk():
+    return random_walk
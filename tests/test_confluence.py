@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from confluence import ConfluenceCache, timeframe_state
+from ohlc import OHLCView
+
+
+def buy(confidence=60):
+    return {'signal': 'buy', 'confidence': confidence}
+
+
+def sell(confidence=60):
+    return {'signal': 'sell', 'confidence': confidence}
+
+
+def test_agreeing_and_opposing_signals():
+    cache = ConfluenceCache()
+    cache.update('EURUSD', '4H', None, [buy()])
+    cache.update('EURUSD', '15m', None, [sell()])
+    # 4H (weight 3) agrees, 15m (weight 1) disagrees
+    assert cache.score('EURUSD', '1H', buy()) == pytest.approx((3 - 1) / 4)
+    assert cache.score('EURUSD', '1H', sell()) == pytest.approx((-3 + 1) / 4)
+
+
+def test_own_timeframe_and_other_pairs_are_ignored():
+    cache = ConfluenceCache()
+    cache.update('EURUSD', '1H', None, [sell()])
+    cache.update('GBPUSD', '4H', None, [sell()])
+    assert cache.score('EURUSD', '1H', buy()) == 0.0
+
+
+def test_trend_and_momentum_without_signal():
+    cache = ConfluenceCache()
+    cache.update('EURUSD', '4H', {'trend': 1, 'momentum': 1}, [])
+    assert cache.score('EURUSD', '1H', buy()) == pytest.approx(0.5)
+    cache.update('EURUSD', '4H', {'trend': 1, 'momentum': -1}, [])
+    assert cache.score('EURUSD', '1H', buy()) == 0.0
+    cache.update('EURUSD', '4H', {'trend': -1, 'momentum': 0}, [])
+    assert cache.score('EURUSD', '1H', buy()) == pytest.approx(-0.25)
+
+
+def test_entries_expire_but_survive_one_scan_interval():
+    cache = ConfluenceCache()
+    cache.update('EURUSD', '15m', None, [buy()])
+    cache.entries[('EURUSD', '15m')]['updated'] -= 3700
+    assert cache.score('EURUSD', '1H', buy()) == 0.0
+
+    cache.scan_interval = 3600
+    assert cache.age_limit('15m') == 5400
+    assert cache.age_limit('4H') == 8 * 3600
+    assert cache.score('EURUSD', '1H', buy()) == 1.0
+
+
+def test_rank_orders_by_boosted_confidence():
+    cache = ConfluenceCache(boost=0.5)
+    cache.update('EURUSD', '4H', None, [sell()])
+    results = [buy(70), sell(60)]
+    ranked = cache.rank('EURUSD', '1H', results)
+    # sell: 60 * 1.5 = 90 beats buy: 70 * 0.5 = 35
+    assert [r['signal'] for r in ranked] == ['sell', 'buy']
+    assert ranked[0]['confluence'] == 1.0
+
+
+def test_timeframe_state():
+    close = 1.1 + np.linspace(0, 0.05, 300)
+    rates = np.zeros(300, dtype=[('time', '<i8'), ('close', '<f8')])
+    rates['close'] = close
+    state = timeframe_state(OHLCView(rates))
+    assert state['trend'] == 1
+    assert state['momentum'] == 1
+    assert state['rsi'] > 55
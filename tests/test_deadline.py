@@ -0,0 +1,65 @@
+import threading
+import time
+
+import pytest
+
+from deadline import ScanBudget, StageTimeout, run_with_timeout
+
+
+def test_returns_result_within_timeout():
+    assert run_with_timeout('fetch', 1.0, lambda a, b=0: a + b, 2, b=3) == 5
+
+
+def test_runs_inline_without_timeout():
+    assert run_with_timeout('fetch', None, threading.current_thread) is threading.current_thread()
+
+
+def test_exceptions_propagate():
+    def fail():
+        raise ValueError('boom')
+
+    with pytest.raises(ValueError, match='boom'):
+        run_with_timeout('fetch', 1.0, fail)
+
+
+def test_overrunning_call_is_abandoned():
+    release = threading.Event()
+    started = time.monotonic()
+    with pytest.raises(StageTimeout) as info:
+        run_with_timeout('send', 0.1, release.wait, 5)
+    assert time.monotonic() - started < 1.0
+    assert info.value.stage == 'send'
+    assert info.value.timeout == 0.1
+    assert isinstance(info.value, TimeoutError)
+    release.set()
+
+
+def test_spent_timeout_does_not_call():
+    calls = []
+    with pytest.raises(StageTimeout):
+        run_with_timeout('chart', 0, calls.append, 1)
+    assert calls == []
+
+
+def test_stage_timeout_is_min_of_stage_and_scan():
+    budget = ScanBudget(5, {'fetch': 15, 'send': 1})
+    assert budget.stage_timeout('send') == 1
+    assert 4 < budget.stage_timeout('fetch') <= 5
+    assert 4 < budget.stage_timeout('chart') <= 5
+
+
+def test_budget_without_scan_deadline():
+    budget = ScanBudget(None, {'fetch': 15})
+    assert budget.remaining() is None
+    assert not budget.expired()
+    assert budget.stage_timeout('fetch') == 15
+    assert budget.stage_timeout('chart') is None
+
+
+def test_expired_budget():
+    budget = ScanBudget(0.01, {'fetch': 15})
+    time.sleep(0.02)
+    assert budget.expired()
+    assert budget.stage_timeout('fetch') == 0
+    with pytest.raises(StageTimeout):
+        budget.run('fetch', lambda: 1)
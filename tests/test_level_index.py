@@ -0,0 +1,64 @@
+import numpy as np
+
+from level_index import LevelIndex, LevelRegistry, swing_levels
+from ohlc import OHLCView
+
+
+def test_update_keeps_levels_sorted():
+    index = LevelIndex()
+    index.update('1H', 'sr', [1.12, 1.08])
+    index.update('4H', 'sr', [1.10, 1.15])
+    assert len(index) == 4
+    assert [entry[0] for entry in index.within(1.1, 1.0)] == [1.08, 1.10, 1.12, 1.15]
+
+
+def test_unchanged_update_is_a_no_op():
+    index = LevelIndex()
+    assert index.update('1H', 'fib', [1.1, 1.2])
+    assert not index.update('1H', 'fib', [1.2, 1.1])
+
+
+def test_update_replaces_only_its_source():
+    index = LevelIndex()
+    index.update('1H', 'sr', [1.10, 1.20])
+    index.update('4H', 'sr', [1.10])
+    index.update('1H', 'sr', [1.30])
+    assert index.within(1.2, 0.2) == [(1.10, '4H', 'sr'), (1.30, '1H', 'sr')]
+
+
+def test_nearest():
+    index = LevelIndex()
+    assert index.nearest(1.1) == (None, float('inf'))
+    index.update('1H', 'sr', [1.00, 1.10, 1.20])
+    entry, distance = index.nearest(1.13)
+    assert entry == (1.10, '1H', 'sr')
+    assert abs(distance - 0.03) < 1e-12
+    assert index.nearest(5.0)[0] == (1.20, '1H', 'sr')
+    assert index.nearest(0.0)[0] == (1.00, '1H', 'sr')
+
+
+def test_within_is_inclusive():
+    index = LevelIndex()
+    index.update('15m', 'sr', [1.0, 2.0, 3.0])
+    assert [entry[0] for entry in index.within(2.0, 1.0)] == [1.0, 2.0, 3.0]
+    assert index.within(2.5, 0.1) == []
+
+
+def test_update_from_bars():
+    rates = np.zeros(120, dtype=[('time', '<i8'), ('open', '<f8'), ('high', '<f8'),
+                                 ('low', '<f8'), ('close', '<f8')])
+    rates['high'] = 1.1 + np.linspace(0, 0.01, 120)
+    rates['low'] = rates['high'] - 0.002
+    view = OHLCView(rates)
+    index = LevelIndex()
+    assert index.update_from('1H', view)
+    assert not index.update_from('1H', view)
+    levels = swing_levels(view)
+    assert len(index) == sum(len(kind) for kind in levels.values())
+    assert max(levels['resistance']) == rates['high'].max()
+
+
+def test_registry_returns_one_index_per_pair():
+    registry = LevelRegistry()
+    assert registry.for_pair('EURUSD') is registry.for_pair('EURUSD')
+    assert registry.for_pair('EURUSD') is not registry.for_pair('GBPUSD')
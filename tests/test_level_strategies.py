@@ -0,0 +1,47 @@
+import pytest
+
+from level_index import LevelIndex
+from level_strategies import fibonacci_indexed, support_resistance_indexed
+from ohlc import OHLCView
+
+from fibonacci import fibonacci_system
+from support_resistance import support_resistance
+
+PAIRS = [(support_resistance, support_resistance_indexed), (fibonacci_system, fibonacci_indexed)]
+FIELDS = ('entry', 'sl', 'tp', 'confidence', 'rsi')
+
+
+def assert_same(reference, fast):
+    assert (reference is None) == (fast is None)
+    if reference is None:
+        return
+    assert fast['signal'] == reference['signal']
+    assert fast.get('level') == pytest.approx(reference.get('level'))
+    assert fast.get('fib_level') == reference.get('fib_level')
+    for field in FIELDS:
+        assert float(fast[field]) == pytest.approx(float(reference[field]), rel=1e-9)
+
+
+@pytest.mark.parametrize('reference_func,fast_func', PAIRS)
+@pytest.mark.parametrize('seed', range(4))
+def test_matches_pandas_reference(make_walk, reference_func, fast_func, seed):
+    rates = make_walk(seed, count=400)
+    signals = 0
+    index = LevelIndex()
+    for end in range(30, len(rates), 3):
+        view = OHLCView(rates[:end])
+        reference = reference_func(view.to_frame())
+        index.update_from('1H', view)
+        assert_same(reference, fast_func(view, index, '1H'))
+        assert_same(reference, fast_func(view))
+        signals += reference is not None
+    assert signals
+
+
+def test_ignores_other_timeframes(make_rates):
+    view = OHLCView(make_rates([1.1] * 120))
+    index = LevelIndex()
+    index.update('4H', 'resistance', [1.1])
+    index.update('4H', 'fib', [1.1])
+    assert support_resistance_indexed(view, index, '1H') is None
+    assert fibonacci_indexed(view, index, '1H') is None
@@ -0,0 +1,55 @@
+import pytest
+
+import memwatch
+from memwatch import MB, MemoryMonitor
+from metrics import ScanMetrics
+
+
+@pytest.fixture
+def rss(monkeypatch):
+    """Set the next RSS sample, in MB"""
+    sample = {'mb': 100}
+    monkeypatch.setattr(memwatch, 'rss_bytes', lambda children=False: sample['mb'] * MB)
+    return sample
+
+
+def test_alerts_once_per_further_step(rss):
+    alerts = []
+    monitor = MemoryMonitor(alert_mb=50, count_objects=False, on_alert=alerts.append)
+    for mb in (100, 140, 155, 170, 205, 260, 230, 262):
+        rss['mb'] = mb
+        monitor.check()
+    # Growth: 0, 40, 55 (alert), 70, 105 (alert), 160 (alert, skips past 150), 130, 162
+    assert len(alerts) == 3
+    assert alerts[0].startswith('RSS grew 55 MB since start')
+    assert monitor.alert_level == 4
+
+
+def test_disabled_alerts(rss):
+    alerts = []
+    monitor = MemoryMonitor(alert_mb=0, count_objects=False, on_alert=alerts.append)
+    rss['mb'] = 100
+    monitor.check()
+    rss['mb'] = 10000
+    monitor.check()
+    assert alerts == []
+
+
+def test_gauges_written_to_metrics(rss):
+    monitor = MemoryMonitor(alert_mb=500, count_objects=False)
+    monitor.check()
+    rss['mb'] = 130
+    metrics = ScanMetrics()
+    report = monitor.check(metrics)
+    gauges = metrics.summary()['gauges']
+    assert gauges['rss_mb'] == pytest.approx(130)
+    assert gauges['rss_growth_mb'] == pytest.approx(30)
+    assert gauges['live_figures'] == 0
+    assert report['growth_mb'] == pytest.approx(30)
+
+
+def test_without_psutil_only_figures_are_reported(monkeypatch):
+    monkeypatch.setattr(memwatch, 'rss_bytes', lambda children=False: None)
+    metrics = ScanMetrics()
+    MemoryMonitor(count_objects=False).check(metrics)
+    assert metrics.summary()['gauges'] == {'live_figures': 0}
@@ -0,0 +1,73 @@
+import math
+
+import numpy as np
+import pytest
+
+from montecarlo import analyze_trades, simulate
+
+R_MULTIPLES = [2.0, -1.0, -1.0, 1.5, -1.0, 3.0, -1.0, 0.5, -1.0, 2.0]
+
+
+def loop_reference(r_multiples, n_paths, n_trades, risk_per_trade, seed):
+    """Per-path Python loop over the same bootstrap draws as simulate()"""
+    r = np.asarray(r_multiples)
+    draws = np.random.default_rng(seed).integers(0, len(r), size=(n_paths, n_trades))
+    drawdowns, finals = [], []
+    for row in draws:
+        equity = peak = 1.0
+        worst = 0.0
+        for i in row:
+            equity *= max(1.0 + r[i] * risk_per_trade, 0.0)
+            peak = max(peak, equity)
+            worst = max(worst, 1.0 - equity / peak)
+        drawdowns.append(worst)
+        finals.append(equity)
+    return np.array(drawdowns), np.array(finals)
+
+
+def test_bootstrap_matches_loop_reference():
+    report = simulate(R_MULTIPLES, n_paths=200, n_trades=30, risk_per_trade=0.02, seed=3)
+    drawdowns, finals = loop_reference(R_MULTIPLES, 200, 30, 0.02, seed=3)
+    for p in (5, 50, 95):
+        assert report['max_drawdown'][p] == pytest.approx(np.percentile(drawdowns, p))
+        assert report['final_equity'][p] == pytest.approx(np.percentile(finals, p))
+    assert report['trades'] == 30
+
+
+def test_shuffle_keeps_final_equity():
+    report = simulate(R_MULTIPLES, n_paths=500, method='shuffle', seed=1)
+    expected = math.prod(1.0 + r * 0.01 for r in R_MULTIPLES)
+    assert report['final_equity'][5] == pytest.approx(expected)
+    assert report['final_equity'][95] == pytest.approx(expected)
+    assert report['max_drawdown'][95] >= report['max_drawdown'][5] > 0
+
+
+def test_seed_makes_runs_reproducible():
+    assert simulate(R_MULTIPLES, n_paths=100, seed=7) == simulate(R_MULTIPLES, n_paths=100, seed=7)
+
+
+def test_summary_statistics():
+    report = simulate(R_MULTIPLES, n_paths=10, seed=0)
+    assert report['expectancy'] == pytest.approx(np.mean(R_MULTIPLES))
+    assert report['win_rate'] == pytest.approx(0.5)
+
+
+def test_ruin_and_no_drawdown_extremes():
+    assert simulate([1.0, 2.0], n_paths=50, seed=0)['max_drawdown'][95] == 0.0
+    assert simulate([1.0, 2.0], n_paths=50, seed=0)['ruin_probability'] == 0.0
+    assert simulate([-60.0], n_paths=50, seed=0)['ruin_probability'] == 1.0
+
+
+def test_invalid_input():
+    assert simulate([]) is None
+    with pytest.raises(ValueError):
+        simulate(R_MULTIPLES, method='jackknife')
+
+
+def test_analyze_trades_groups_by_strategy_and_pair():
+    trades = [{'strategy': 'a', 'pair': 'EURUSD', 'r': 1.0},
+              {'strategy': 'a', 'pair': 'EURUSD', 'r': -1.0},
+              {'strategy': 'b', 'pair': 'GBPUSD', 'r': 2.0}]
+    reports = analyze_trades(trades, n_paths=20, seed=0)
+    assert list(reports) == [('a', 'EURUSD'), ('b', 'GBPUSD')]
+    assert reports[('a', 'EURUSD')]['trades'] == 2
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from ohlc import OHLCView, _narrow, compact_rates
+
+
+def test_row_size_halves(make_rates):
+    rates = make_rates([1.08765] * 4, 5)
+    assert rates.dtype.itemsize == 60
+    assert compact_rates(rates).dtype.itemsize == 30
+    assert compact_rates(rates, digits=5).dtype.itemsize == 30
+
+
+@pytest.mark.parametrize('bars, full, compact', [
+    (24960, '1.50 MB', '0.75 MB'),
+    (6240, '0.37 MB', '0.19 MB'),
+    (1560, '94 KB', '47 KB'),
+])
+def test_docstring_memory_figures(bars, full, compact, make_rates):
+    def fmt(nbytes):
+        return f"{nbytes / 1e6:.2f} MB" if nbytes >= 1e5 else f"{nbytes / 1e3:.0f} KB"
+
+    rates = make_rates(np.full(bars, 1.1), 5)
+    assert fmt(rates.nbytes) == full
+    assert fmt(compact_rates(rates).nbytes) == compact
+    assert full in compact_rates.__doc__ and compact in compact_rates.__doc__
+
+
+@pytest.mark.parametrize('digits, low, high', [(3, 100.0, 190.0), (5, 0.5, 1.9)])
+def test_points_round_trip_exactly(digits, low, high, make_rates):
+    rng = np.random.default_rng(7)
+    rates = make_rates(rng.uniform(low, high, 1000), digits)
+    view = OHLCView(compact_rates(rates, digits), digits)
+    assert view.rates['close'].dtype == np.int32
+    for column in ('open', 'high', 'low', 'close'):
+        restored = view.values(column)
+        assert np.array_equal(np.round(restored, digits), rates[column])
+        assert np.array_equal(np.rint(restored * 10 ** digits), np.rint(rates[column] * 10 ** digits))
+
+
+def test_narrow_falls_back_on_overflow():
+    assert _narrow(np.array([0, 65000], dtype=np.int64), np.uint32) == np.uint32
+    assert _narrow(np.array([0, 2 ** 40], dtype=np.uint64), np.uint32) == np.uint64
+    assert _narrow(np.array([-1, 5], dtype=np.int64), np.uint32) == np.int64
+    assert _narrow(np.array([], dtype=np.int32), np.int16) == np.int16
+
+
+def test_compact_keeps_wide_volumes(make_rates):
+    rates = make_rates([1.1, 1.2], 5)
+    rates['real_volume'] = [0, 2 ** 40]
+    compact = compact_rates(rates)
+    assert compact.dtype['real_volume'] == np.uint64
+    assert compact['real_volume'][1] == 2 ** 40
+    assert compact.dtype['tick_volume'] == np.uint32
+
+
+def test_points_that_overflow_int32_fall_back_to_float32(make_rates):
+    rates = make_rates([45000.12345, 45100.5], 5)
+    compact = compact_rates(rates, digits=5)
+    assert compact.dtype['close'] == np.float32
+    assert np.allclose(compact['close'], rates['close'], rtol=1e-6)
+
+    view = OHLCView(rates).compact(5)
+    assert view.digits is None
+    assert view.values('close')[0] == pytest.approx(45000.12345, rel=1e-6)
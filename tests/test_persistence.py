@@ -0,0 +1,100 @@
+from ohlc import OHLCView
+from persistence import SignalStore, SQLiteBackend
+
+
+def make_store(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / 'store.db'))
+    return SignalStore(backend), backend
+
+
+def buy_signal():
+    return {'name': 'Moving Average Crossover', 'strategy': 'ma_crossover', 'signal': 'BUY',
+            'entry': 1.1, 'sl': 1.09, 'tp': 1.12, 'confidence': 70}
+
+
+class FailingBackend:
+    """Backend whose open fails ``open_failures`` times and inserts fail while ``broken``"""
+
+    def __init__(self, open_failures=0, broken=False):
+        self.open_failures = open_failures
+        self.broken = broken
+        self.opens = 0
+        self.rows = []
+
+    def open(self):
+        self.opens += 1
+        if self.opens <= self.open_failures:
+            raise OSError("unable to open database file")
+
+    def insert_many(self, table, rows):
+        if self.broken:
+            raise OSError("connection lost")
+        self.rows.extend((table,) + row[:1] for row in rows)
+
+    def close(self):
+        pass
+
+
+def test_forming_bar_is_updated(tmp_path, make_rates):
+    store, backend = make_store(tmp_path)
+    store.record_bars('EURUSD', '1H', OHLCView(make_rates([1.10, 1.11], step=3600)))
+    store.flush()
+    # Same bars later in the hour: the last one has moved
+    store.record_bars('EURUSD', '1H', OHLCView(make_rates([1.10, 1.15], step=3600)))
+    store.flush()
+    store.record_bars('EURUSD', '1H', OHLCView(make_rates([1.10, 1.15, 1.16], step=3600)))
+    store.flush()
+
+    rows = backend.conn.execute("SELECT time, close FROM bars ORDER BY time").fetchall()
+    assert [close for _, close in rows] == [1.10, 1.15, 1.16]
+    store.stop()
+
+
+def test_signal_stores_strategy_key(tmp_path):
+    store, backend = make_store(tmp_path)
+    store.record_signal('EURUSD', '1H', buy_signal())
+    store.flush()
+    assert backend.conn.execute("SELECT strategy FROM signals").fetchone() == ('ma_crossover',)
+    store.stop()
+
+
+def test_unwritable_sqlite_path_does_not_raise(tmp_path):
+    store = SignalStore(SQLiteBackend(str(tmp_path / 'missing' / 'store.db')), flush_interval=0.01).start()
+    store.record_signal('EURUSD', '1H', buy_signal())
+    store.record_scan({'wall_time': 1.0})
+    store.stop()
+
+
+def test_open_failure_backs_off_then_recovers():
+    backend = FailingBackend(open_failures=1)
+    store = SignalStore(backend, flush_interval=10)
+    store.record_signal('EURUSD', '1H', buy_signal())
+    assert not store.flush()
+    # Within the backoff no reconnect is attempted
+    assert not store.flush()
+    assert backend.opens == 1
+
+    store._retry_at = 0
+    assert store.flush()
+    assert [row[0] for row in backend.rows] == ['signals']
+
+
+def test_insert_failure_reconnects_later():
+    backend = FailingBackend(broken=True)
+    store = SignalStore(backend, flush_interval=10)
+    store.record_signal('EURUSD', '1H', buy_signal())
+    assert not store.flush()
+
+    backend.broken = False
+    store._retry_at = 0
+    store.record_signal('EURUSD', '1H', buy_signal())
+    assert store.flush()
+    assert backend.opens == 2
+    assert len(backend.rows) == 1
+
+
+def test_backlog_is_capped_while_backend_is_down():
+    store = SignalStore(FailingBackend(open_failures=10 ** 6), max_pending=3)
+    for _ in range(5):
+        store.record_scan({'wall_time': 1.0})
+    assert store.dropped == 2
@@ -0,0 +1,64 @@
+import numpy as np
+
+from level_index import LevelIndex, swing_levels
+from ohlc import OHLCView
+from priority import ScanPrioritizer, scan_stats
+
+
+def stats(atr_ratio=1.0, level_distance=1.0, level_pct=0.001):
+    return {'atr_ratio': atr_ratio, 'level_distance': level_distance, 'level_pct': level_pct,
+            'updated': 0.0}
+
+
+QUIET = stats(atr_ratio=0.5, level_distance=20.0, level_pct=0.05)
+
+
+def test_orders_hottest_first():
+    prioritizer = ScanPrioritizer()
+    prioritizer.set_stats('EURUSD', '1H', stats(atr_ratio=1.0))
+    prioritizer.set_stats('GBPUSD', '1H', stats(atr_ratio=2.0))
+    prioritizer.set_stats('USDJPY', '1H', stats(atr_ratio=1.0, level_distance=0.0))
+    ordered, skipped = prioritizer.order([('EURUSD', '1H'), ('GBPUSD', '1H'), ('USDJPY', '1H')])
+    assert [item[0] for item in ordered] == ['GBPUSD', 'USDJPY', 'EURUSD']
+    assert skipped == []
+
+
+def test_unseen_items_come_first():
+    prioritizer = ScanPrioritizer()
+    prioritizer.set_stats('EURUSD', '1H', stats(atr_ratio=5.0))
+    ordered, _ = prioritizer.order([('EURUSD', '1H', 16385), ('GBPUSD', '1H', 16385)])
+    assert ordered == [('GBPUSD', '1H', 16385), ('EURUSD', '1H', 16385)]
+
+
+def test_quiet_needs_low_volatility_and_no_nearby_level():
+    prioritizer = ScanPrioritizer(quiet_atr_ratio=0.8, level_proximity=0.01)
+    prioritizer.set_stats('A', '1H', QUIET)
+    prioritizer.set_stats('B', '1H', stats(atr_ratio=0.5, level_pct=0.005))   # near a level
+    prioritizer.set_stats('C', '1H', stats(atr_ratio=1.2, level_pct=0.05))    # volatile
+    assert prioritizer.is_quiet('A', '1H')
+    assert not prioritizer.is_quiet('B', '1H')
+    assert not prioritizer.is_quiet('C', '1H')
+    assert not prioritizer.is_quiet('D', '1H')
+    _, skipped = prioritizer.order([('A', '1H'), ('B', '1H'), ('C', '1H')])
+    assert skipped == [('A', '1H')]
+
+
+def test_max_skips_caps_and_resets():
+    prioritizer = ScanPrioritizer(max_skips=2)
+    prioritizer.set_stats('A', '1H', QUIET)
+    items = [('A', '1H')]
+    assert [prioritizer.order(items)[1] for _ in range(3)] == [items, items, []]
+    # The forced scan resets the count
+    assert prioritizer.order(items)[1] == items
+
+
+def test_scan_stats_level_pct(make_walk):
+    view = OHLCView(make_walk(3))
+    price = float(view.values('close')[-1])
+    levels = swing_levels(view)
+    nearest = min(abs(price - level) for kind in levels.values() for level in kind)
+    assert np.isclose(scan_stats(view)['level_pct'], nearest / price)
+
+    index = LevelIndex()
+    index.update('4H', 'sr', [price])
+    assert scan_stats(view, index)['level_pct'] == 0.0
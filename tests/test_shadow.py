@@ -0,0 +1,77 @@
+import pytest
+
+from metrics import ScanMetrics
+from ohlc import OHLCView
+from shadow import ShadowRunner, compare_results, shadow_compare
+
+from breakout import breakout
+from fibonacci import fibonacci_system
+from ma_crossover import ma_crossover
+from rsi_reversal import rsi_reversal
+from support_resistance import support_resistance
+from trend_atr import trend_atr
+
+STRATEGIES = {'MA+RSI': ma_crossover, 'RSI Rev': rsi_reversal, 'Breakout': breakout,
+              'Trend+ATR': trend_atr, 'SupportRes': support_resistance, 'FibSK': fibonacci_system}
+
+
+def result(signal='buy', entry=1.1, sl=1.09, tp=1.12, confidence=60.0):
+    return {'signal': signal, 'entry': entry, 'sl': sl, 'tp': tp, 'confidence': confidence}
+
+
+def test_identical_results_agree():
+    assert compare_results(result(), result()) == []
+    assert compare_results(None, None) == []
+
+
+def test_price_tolerance_is_relative():
+    assert compare_results(result(entry=1.1), result(entry=1.1 * (1 + 5e-6))) == []
+    divergences = compare_results(result(entry=1.1), result(entry=1.1 * (1 + 5e-5)))
+    assert len(divergences) == 1 and divergences[0].startswith('entry')
+    assert compare_results(result(entry=1.1), result(entry=1.1 * (1 + 5e-5)), price_tolerance=1e-4) == []
+
+
+def test_confidence_tolerance_is_absolute():
+    assert compare_results(result(confidence=60.0), result(confidence=60.4)) == []
+    assert compare_results(result(confidence=60.0), result(confidence=61.0)) == ['confidence 60.0 != 61.0']
+
+
+def test_direction_mismatch():
+    assert compare_results(result('buy'), result('sell')) == ['signal buy != sell']
+
+
+def test_missing_and_extra_signals():
+    assert compare_results(result(), None) == ['signal missing in fast path']
+    assert compare_results(None, result()) == ['signal extra in fast path']
+
+
+def test_strategy_errors_are_reported_as_divergences(make_walk):
+    def broken(df):
+        raise ValueError('boom')
+
+    report = shadow_compare(OHLCView(make_walk(0)), {'MA+RSI': ma_crossover},
+                            fast_strategies={'MA+RSI': broken})
+    assert report['divergences'] == {'MA+RSI': ['fast error: boom']}
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_view_and_dataframe_paths_agree(make_walk, seed):
+    report = shadow_compare(OHLCView(make_walk(seed)), STRATEGIES)
+    assert report['divergences'] == {}
+    assert report['reference_time'] > 0 and report['fast_time'] > 0
+
+
+def test_runner_records_metrics(make_walk):
+    metrics = ScanMetrics()
+    runner = ShadowRunner(STRATEGIES, sample_rate=1.0)
+    assert runner.maybe_run('EURUSD', '1H', OHLCView(make_walk(1)), metrics) is not None
+    summary = metrics.summary()
+    assert summary['counters']['shadow_runs'] == 1
+    assert summary['gauges']['shadow_speedup'] > 0
+    assert ShadowRunner(STRATEGIES, sample_rate=0.0).maybe_run('EURUSD', '1H', None, metrics) is None
+
+
+def test_fast_path_does_not_reuse_the_scan_view(make_walk):
+    view = OHLCView(make_walk(2))
+    shadow_compare(view, {'MA+RSI': ma_crossover})
+    assert view._series == {}
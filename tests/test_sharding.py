@@ -0,0 +1,62 @@
+import time
+
+from sharding import LocalWorkQueue, scan_sharded, shard_items, worker_loop
+
+
+def test_shard_items_round_robin():
+    assert shard_items(list(range(7)), 3) == [[0, 3, 6], [1, 4], [2, 5]]
+
+
+def test_shard_items_never_returns_empty_shards():
+    assert shard_items([1, 2], 8) == [[1], [2]]
+    assert shard_items([], 4) == []
+
+
+def test_local_queue_pop_times_out():
+    work_queue = LocalWorkQueue()
+    assert work_queue.pop_task(timeout=0.01) is None
+    assert work_queue.pop_result(timeout=0.01) is None
+
+
+def test_worker_loop_drains_queue():
+    work_queue = LocalWorkQueue()
+    work_queue.push_task({'scan': 'a', 'shard': 0, 'items': [1, -2]})
+    work_queue.push_task({'scan': 'a', 'shard': 1, 'items': [-3]})
+    assert worker_loop(work_queue, abs, idle_timeout=0.01) == 2
+    assert work_queue.pop_result(0.01) == {'scan': 'a', 'shard': 0, 'results': [1, 2]}
+    assert work_queue.pop_result(0.01) == {'scan': 'a', 'shard': 1, 'results': [3]}
+
+
+def test_scan_sharded_with_local_queue():
+    results = scan_sharded(list(range(-10, 10)), abs, workers=2,
+                           work_queue=LocalWorkQueue(), local_workers=2, timeout=5)
+    assert sorted(results) == sorted(abs(i) for i in range(-10, 10))
+
+
+def test_scan_sharded_ignores_stale_results():
+    work_queue = LocalWorkQueue()
+    work_queue.push_result({'scan': 'earlier', 'shard': 0, 'results': [999]})
+    results = scan_sharded([-1, -2, -3], abs, workers=1, shards_per_worker=3,
+                           work_queue=work_queue, local_workers=1, timeout=5)
+    assert sorted(results) == [1, 2, 3]
+
+
+def test_scan_sharded_queue_timeout_returns_partial():
+    work_queue = LocalWorkQueue()
+    started = time.time()
+    results = scan_sharded([0.0, 2.0], time.sleep, workers=2, shards_per_worker=1,
+                           work_queue=work_queue, local_workers=2, timeout=0.5)
+    assert time.time() - started < 1.5
+    assert results == [None]
+
+
+def test_scan_sharded_process_pool():
+    results = scan_sharded(list(range(-6, 6)), abs, workers=2)
+    assert sorted(results) == sorted(abs(i) for i in range(-6, 6))
+
+
+def test_scan_sharded_process_pool_honours_timeout():
+    started = time.time()
+    results = scan_sharded([0.0, 2.0], time.sleep, workers=2, shards_per_worker=1, timeout=0.5)
+    assert time.time() - started < 1.5
+    assert results == [None]
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from ohlc import OHLCView
+from shm_executor import StrategyPool, from_record, to_record
+
+STRATEGY_MODULES = {
+    'MA+RSI':     ('ma_crossover', 'ma_crossover'),
+    'RSI Rev':    ('rsi_reversal', 'rsi_reversal'),
+    'Breakout':   ('breakout', 'breakout'),
+    'Trend+ATR':  ('trend_atr', 'trend_atr'),
+    'SupportRes': ('support_resistance', 'support_resistance'),
+    'FibSK':      ('fibonacci', 'fibonacci_system')
+}
+
+
+def serial_results(view):
+    import importlib
+    results = {}
+    for name, (module_name, func_name) in STRATEGY_MODULES.items():
+        result = getattr(importlib.import_module(module_name), func_name)(view)
+        results[name] = from_record(to_record(result)) if result else None
+    return results
+
+
+@pytest.fixture(scope='module')
+def pool():
+    pool = StrategyPool(STRATEGY_MODULES, workers=2)
+    yield pool
+    pool.close()
+
+
+def test_record_round_trip():
+    result = {'name': 'X', 'signal': 'BUY', 'entry': np.float64(1.1), 'sl': 1.0, 'tp': 1.3,
+              'confidence': 60, 'rsi': np.float32(55.5)}
+    restored = from_record(to_record(result))
+    assert restored == {k: float(v) if isinstance(v, np.floating) else v for k, v in result.items()}
+    assert type(restored['entry']) is float
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_pool_matches_serial(pool, seed, make_walk):
+    view = OHLCView(make_walk(seed))
+    assert pool.run(view, timeout=30) == serial_results(view)
+
+
+def test_pool_matches_serial_on_compact_bars(pool, make_walk):
+    view = OHLCView(make_walk(42)).compact(5)
+    assert pool.run(view, timeout=30) == serial_results(view)
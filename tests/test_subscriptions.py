@@ -0,0 +1,198 @@
+import threading
+import time
+import types
+
+import pytest
+
+from subscriptions import FanOutDispatcher, Subscription, SubscriptionRegistry, TokenBucket
+
+
+class RecordingBot:
+    """
+    Collects (method, chat_id) calls and counts file uploads; optional
+    per-method failures, rejected parse modes and delays.
+    """
+
+    def __init__(self, fail=(), reject_modes=(), delays=None):
+        self.fail = set(fail)
+        self.reject_modes = set(reject_modes)
+        self.delays = delays or {}
+        self.calls = []
+        self.modes = []
+        self.uploads = 0
+        self.lock = threading.Lock()
+
+    def _call(self, method, chat_id, parse_mode=None, uploads=0, items=1):
+        time.sleep(self.delays.get((method, chat_id), 0))
+        with self.lock:
+            self.calls.append((method, chat_id))
+            self.modes.append(parse_mode)
+            if method in self.fail or parse_mode in self.reject_modes:
+                raise RuntimeError(f"{method} rejected")
+            self.uploads += uploads
+            first = self.uploads
+        return [types.SimpleNamespace(photo=[types.SimpleNamespace(file_id=f"file-{first - i}")])
+                for i in range(items)]
+
+    def send_message(self, chat_id, text, parse_mode=None, **kwargs):
+        return self._call('send_message', chat_id, parse_mode)[0]
+
+    def send_photo(self, chat_id, photo, parse_mode=None, **kwargs):
+        return self._call('send_photo', chat_id, parse_mode, not isinstance(photo, str))[0]
+
+    def send_media_group(self, chat_id, media, **kwargs):
+        uploads = sum(not isinstance(m.media, str) for m in media)
+        return self._call('send_media_group', chat_id, media[0].parse_mode, uploads, len(media))
+
+
+def signal(name, strategy, confidence):
+    return {'name': name, 'strategy': strategy, 'signal': 'BUY', 'confidence': confidence}
+
+
+def render_to(tmp_path):
+    def render(pair, timeframe, df, result):
+        path = tmp_path / f"{pair}_{timeframe}_{result['strategy']}.png"
+        path.write_bytes(b'png')
+        return str(path)
+    return render
+
+
+def caption(result, pair, timeframe):
+    text = f"{pair} {timeframe} {result['strategy']}"
+    return [(f"*{text}*", 'Markdown'), (f"<b>{text}</b>", 'HTML'), (text, None)]
+
+
+def test_token_bucket_allows_burst_then_rate():
+    bucket = TokenBucket(rate=20, capacity=2)
+    started = time.monotonic()
+    for _ in range(4):
+        bucket.acquire()
+    elapsed = time.monotonic() - started
+    # Two tokens from the burst, two more at 20/s
+    assert 0.08 <= elapsed < 0.5
+
+
+def test_token_bucket_refills_up_to_capacity():
+    bucket = TokenBucket(rate=100, capacity=3)
+    bucket.acquire(3)
+    time.sleep(0.1)
+    started = time.monotonic()
+    bucket.acquire(3)
+    assert time.monotonic() - started < 0.02
+
+
+def test_token_bucket_grants_more_than_capacity_then_waits():
+    bucket = TokenBucket(rate=20, capacity=1)
+    started = time.monotonic()
+    bucket.acquire(3)
+    assert time.monotonic() - started < 0.02
+    bucket.acquire()
+    # The two-token debt plus the next token at 20/s
+    assert 0.12 <= time.monotonic() - started < 0.5
+
+
+def test_subscription_matches_key_or_name():
+    subscription = Subscription(1, pairs=['EURUSD'], strategies=['breakout'], min_confidence=60)
+    assert subscription.matches('EURUSD', '1H', signal('Breakout', 'breakout', 70))
+    assert not subscription.matches('GBPUSD', '1H', signal('Breakout', 'breakout', 70))
+    assert not subscription.matches('EURUSD', '1H', signal('Breakout', 'breakout', 50))
+    assert Subscription(1, strategies=['Breakout']).matches('EURUSD', '1H', signal('Breakout', 'b', 50))
+
+
+def test_best_matches_picks_first_accepted_result():
+    registry = SubscriptionRegistry([Subscription(1), Subscription(2, strategies=['fib']),
+                                     Subscription(3, strategies=['none'])])
+    results = [signal('MA', 'ma', 80), signal('Fib', 'fib', 60)]
+    matches = registry.best_matches('EURUSD', '1H', results)
+    assert matches == {1: results[0], 2: results[1]}
+
+
+def test_registry_round_trip(tmp_path):
+    registry = SubscriptionRegistry([Subscription(-100, pairs=['EURUSD'], min_confidence=55)])
+    registry.save(tmp_path / 'subs.json')
+    loaded = SubscriptionRegistry.load(tmp_path / 'subs.json').subscriptions[0]
+    assert (loaded.chat_id, loaded.pairs, loaded.min_confidence) == (-100, {'EURUSD'}, 55)
+
+
+def test_dispatch_sends_each_chat_its_best_match(tmp_path):
+    pytest.importorskip('telebot')
+    bot = RecordingBot()
+    registry = SubscriptionRegistry([Subscription(1), Subscription(2, strategies=['fib'])])
+    dispatcher = FanOutDispatcher(bot, registry, global_rate=1000, chat_rate=1000)
+    captions = []
+    digest = [('EURUSD', '1H', None, [signal('MA', 'ma', 80), signal('Fib', 'fib', 60)])]
+
+    def record_caption(result, pair, timeframe):
+        captions.append(result['strategy'])
+        return caption(result, pair, timeframe)
+
+    assert dispatcher.dispatch(digest, render_to(tmp_path), record_caption) == 2
+    assert sorted(captions) == ['fib', 'ma']
+    assert sorted(bot.calls) == [('send_photo', 1), ('send_photo', 2)]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_rejected_media_group_falls_back_to_single_photos(tmp_path):
+    pytest.importorskip('telebot')
+    bot = RecordingBot(fail={'send_media_group'})
+    dispatcher = FanOutDispatcher(bot, SubscriptionRegistry([Subscription(1)]),
+                                  global_rate=1000, chat_rate=1000)
+    digest = [(pair, '1H', None, [signal('MA', 'ma', 70)]) for pair in ('EURUSD', 'GBPUSD', 'USDJPY')]
+    assert dispatcher.dispatch(digest, render_to(tmp_path), caption) == 3
+    assert bot.calls == [('send_media_group', 1)] + [('send_photo', 1)] * 3
+
+
+def test_slow_chat_does_not_block_others(tmp_path):
+    pytest.importorskip('telebot')
+    bot = RecordingBot(delays={('send_message', 1): 0.5})
+    registry = SubscriptionRegistry([Subscription(1), Subscription(2)])
+    dispatcher = FanOutDispatcher(bot, registry, global_rate=1000, chat_rate=1000)
+    digest = [('EURUSD', '1H', None, [signal('MA', 'ma', 70)])]
+    assert dispatcher.dispatch(digest, lambda *args: None, caption) == 2
+    assert bot.calls == [('send_message', 2), ('send_message', 1)]
+
+
+def test_sends_are_abandoned_after_send_timeout(tmp_path):
+    pytest.importorskip('telebot')
+    bot = RecordingBot(delays={('send_message', 1): 1.0})
+    dispatcher = FanOutDispatcher(bot, SubscriptionRegistry([Subscription(1)]),
+                                  global_rate=1000, chat_rate=1000, send_timeout=0.1)
+    started = time.monotonic()
+    digest = [('EURUSD', '1H', None, [signal('MA', 'ma', 70)])]
+    assert dispatcher.dispatch(digest, lambda *args: None, caption) == 0
+    assert time.monotonic() - started < 0.5
+
+
+def test_each_chart_is_uploaded_once(tmp_path):
+    pytest.importorskip('telebot')
+    bot = RecordingBot(delays={('send_media_group', chat_id): 0.05 for chat_id in range(6)})
+    registry = SubscriptionRegistry([Subscription(chat_id) for chat_id in range(6)])
+    dispatcher = FanOutDispatcher(bot, registry, global_rate=1000, chat_rate=1000)
+    digest = [(pair, '1H', None, [signal('MA', 'ma', 70)]) for pair in ('EURUSD', 'GBPUSD', 'USDJPY')]
+    assert dispatcher.dispatch(digest, render_to(tmp_path), caption) == 18
+    assert bot.uploads == 3
+
+
+def test_media_group_takes_a_token_per_photo(tmp_path):
+    pytest.importorskip('telebot')
+    bot = RecordingBot()
+    dispatcher = FanOutDispatcher(bot, SubscriptionRegistry([Subscription(1)]),
+                                  global_rate=1000, chat_rate=20)
+    digest = [(pair, '1H', None, [signal('MA', 'ma', 70)]) for pair in ('EURUSD', 'GBPUSD', 'USDJPY')]
+    started = time.monotonic()
+    assert dispatcher.dispatch(digest, render_to(tmp_path), caption) == 3
+    dispatcher._throttle(1)
+    # The three-photo group leaves the bucket two tokens in debt; the next call waits for three at 20/s
+    assert 0.12 <= time.monotonic() - started < 0.5
+
+
+def test_rejected_markdown_falls_back_to_html_then_plain_text(tmp_path):
+    pytest.importorskip('telebot')
+    bot = RecordingBot(reject_modes={'Markdown', 'HTML'})
+    dispatcher = FanOutDispatcher(bot, SubscriptionRegistry([Subscription(1)]),
+                                  global_rate=1000, chat_rate=1000)
+    digest = [('EURUSD', '1H', None, [signal('MA', 'ma', 70)])]
+    assert dispatcher.dispatch(digest, lambda *args: None, caption) == 1
+    assert dispatcher.dispatch(digest, render_to(tmp_path), caption) == 1
+    assert bot.modes == ['Markdown', 'HTML', None] * 2
+    assert bot.uploads == 1